@@ -0,0 +1,63 @@
+# async_runtime.py
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Coroutine, Optional
+
+logger = logging.getLogger(__name__)
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """Returns the process-wide event loop behind the synchronous APIs, starting it on first use.
+
+    The loop runs forever on a daemon thread, so connection pools and
+    background tasks bound to it survive between synchronous calls.
+    """
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(target=_loop.run_forever, name="async-runtime", daemon=True)
+            _loop_thread.start()
+        return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+    """Runs a coroutine on the background loop and blocks until it finishes.
+
+    Safe to call from any thread, including one running its own event loop,
+    except the background loop's thread itself.
+
+    Args:
+        coro (Coroutine): The coroutine to run.
+        timeout (float, optional): Seconds to wait before cancelling the coroutine.
+
+    Returns:
+        Any: The coroutine's result.
+
+    Raises:
+        TimeoutError: If the timeout expires; the coroutine is cancelled.
+        RuntimeError: If called from the background loop's thread, where it would deadlock.
+    """
+    loop = get_background_loop()
+    if threading.current_thread() is _loop_thread:
+        coro.close()
+        raise RuntimeError("run_sync() cannot be called from the background event loop; await the coroutine instead")
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result(timeout)
+    except FutureTimeoutError:
+        if future.done():
+            raise  # The coroutine itself raised TimeoutError
+        future.cancel()
+        raise TimeoutError(f"Coroutine did not finish within {timeout}s")
+    except BaseException:
+        # The caller was interrupted (e.g. KeyboardInterrupt); stop the work it was waiting on
+        future.cancel()
+        raise
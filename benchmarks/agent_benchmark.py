@@ -0,0 +1,63 @@
+# agent_benchmark.py
+#
+# Load test of the agent pipeline without the network. Every model call goes to
+# the deterministic FakeProvider, which answers after a configurable latency
+# and token rate, and web search is disabled. Runs the think-tank workflow
+# several times, optionally several workflows at once, and reports workflow
+# latency percentiles, the critical path and model call throughput.
+#
+#   python benchmarks/agent_benchmark.py
+#   python benchmarks/agent_benchmark.py --runs 20 --concurrency 4 --latency 0.5 --tokens-per-second 100
+
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import FakeProvider, ModelManager  # noqa: E402
+from search_benchmark import percentile  # noqa: E402
+from workflow import think_tank_workflow  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the agent workflow against the fake LLM provider.")
+    parser.add_argument('--runs', type=int, default=8, help="Workflows to run")
+    parser.add_argument('--concurrency', type=int, default=1, help="Workflows running at once")
+    parser.add_argument('--parallelism', type=int, default=4, help="Agent steps running at once per workflow")
+    parser.add_argument('--latency', type=float, default=0.3, help="Seconds before each call's first token")
+    parser.add_argument('--tokens-per-second', type=float, default=200, help="Fake model output rate")
+    parser.add_argument('--output-tokens', type=int, default=300, help="Tokens per fake answer")
+    parser.add_argument('--log-level', default='ERROR', help="Logging level while the workload runs")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(args.log_level.upper())
+
+    provider = FakeProvider(latency=args.latency, tokens_per_second=args.tokens_per_second,
+                            output_tokens=args.output_tokens)
+    manager = ModelManager(search_enabled=False, cache_responses=False, provider=provider)
+
+    def run(index):
+        workflow = think_tank_workflow(manager, max_parallelism=args.parallelism)
+        return workflow.run(f"Benchmark request {index}: outline a report on urban heat islands", [])
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(args.concurrency, 1)) as executor:
+        results = list(executor.map(run, range(args.runs)))
+    elapsed = time.perf_counter() - start
+
+    wall_times = [result['wall_time'] for result in results]
+    serial_time = sum(timing['duration'] for timing in results[0]['timings'].values())
+    print(f"{args.runs} workflows, concurrency {args.concurrency}, step parallelism {args.parallelism}\n")
+    print(f"workflow latency  p50 {percentile(wall_times, 50):.2f}s  p95 {percentile(wall_times, 95):.2f}s  "
+          f"max {max(wall_times):.2f}s")
+    print(f"critical path  {' -> '.join(results[0]['critical_path'])}  "
+          f"{results[0]['critical_path_latency']:.2f}s (steps run back to back: {serial_time:.2f}s)")
+    print(f"throughput  {args.runs / elapsed:.2f} workflows/s  {provider.calls / elapsed:.1f} model calls/s  "
+          f"({elapsed:.2f}s total)")
+
+
+if __name__ == '__main__':
+    main()
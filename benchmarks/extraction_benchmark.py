@@ -0,0 +1,126 @@
+# extraction_benchmark.py
+#
+# Compares throughput and peak memory of the HTML-to-text extraction backends on
+# the recorded pages in benchmarks/corpus (plus a synthetic multi-megabyte page).
+#
+#   python benchmarks/extraction_benchmark.py
+#   python benchmarks/extraction_benchmark.py --record https://example.com/article
+
+import argparse
+import os
+import re
+import sys
+import time
+import tracemalloc
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extraction import BACKENDS, Html2TextBackend, available_backends  # noqa: E402
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+
+
+def record_pages(urls, corpus_dir=CORPUS_DIR):
+    """Downloads pages into the corpus so they can be benchmarked offline."""
+    from http_client import get_http_client
+    from search_manager import WebContentExtractor
+
+    for url in urls:
+        response = get_http_client().get(url, headers=WebContentExtractor.browser_headers(), timeout=15)
+        response.raise_for_status()
+        parsed = urlparse(url)
+        name = re.sub(r'[^\w.-]+', '_', f"{parsed.netloc}{parsed.path}").strip('_')[:100] or 'page'
+        path = os.path.join(corpus_dir, f"{name}.html")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(response.text)
+        print(f"Recorded {url} -> {path}")
+
+
+def load_corpus(corpus_dir=CORPUS_DIR, large_page_kb=2048):
+    """Loads the corpus pages, adding one synthetic large page built from them."""
+    pages = {}
+    for filename in sorted(os.listdir(corpus_dir)):
+        if filename.endswith('.html'):
+            with open(os.path.join(corpus_dir, filename), encoding='utf-8') as f:
+                pages[filename] = f.read()
+    if large_page_kb and pages:
+        paragraphs = re.findall(r'<p>.*?</p>', ''.join(pages.values()), re.DOTALL) or ['<p>filler text</p>']
+        body, size = [], 0
+        while size < large_page_kb * 1024:
+            for paragraph in paragraphs:
+                body.append(f'<div class="comment">{paragraph}</div>')
+                size += len(paragraph) + 30
+        pages['synthetic_large.html'] = (f"<html><body><nav>menu</nav><article>{''.join(body)}</article>"
+                                         f"<footer>footer</footer></body></html>")
+    return pages
+
+
+def word_overlap(text, reference):
+    """Jaccard similarity of the word sets of two texts."""
+    words, reference_words = set(re.findall(r'\w+', text.lower())), set(re.findall(r'\w+', reference.lower()))
+    if not words and not reference_words:
+        return 1.0
+    return len(words & reference_words) / len(words | reference_words)
+
+
+def benchmark_backend(backend, pages, min_seconds):
+    """Runs one backend over the corpus repeatedly and returns its measurements."""
+    # Peak memory of a single pass, measured separately so tracing does not skew timing
+    tracemalloc.start()
+    outputs = {name: backend.extract(html) for name, html in pages.items()}
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    count, start = 0, time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        for html in pages.values():
+            backend.extract(html)
+            count += 1
+    elapsed = time.perf_counter() - start
+    mb = sum(len(html.encode('utf-8')) for html in pages.values()) * (count / len(pages)) / 1024 / 1024
+    return {
+        'pages_per_sec': count / elapsed,
+        'mb_per_sec': mb / elapsed,
+        'peak_mb': peak / 1024 / 1024,
+        'outputs': outputs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the HTML-to-text extraction backends.")
+    parser.add_argument('--corpus', default=CORPUS_DIR, help="Directory of recorded .html pages")
+    parser.add_argument('--record', nargs='+', metavar='URL', help="Record pages into the corpus and exit")
+    parser.add_argument('--seconds', type=float, default=3.0, help="Minimum timed run per backend")
+    parser.add_argument('--large-page-kb', type=int, default=2048, help="Size of the synthetic page (0 to skip)")
+    args = parser.parse_args()
+
+    if args.record:
+        record_pages(args.record, args.corpus)
+        return
+
+    pages = load_corpus(args.corpus, args.large_page_kb)
+    installed = available_backends()
+    results = {name: benchmark_backend(BACKENDS[name](), pages, args.seconds)
+               for name in BACKENDS if name in installed}
+    baseline = results.get(Html2TextBackend.name)
+
+    print(f"{len(pages)} pages, {sum(len(html) for html in pages.values()) / 1024:.0f} KB total\n")
+    print(f"{'backend':<12}{'pages/s':>10}{'MB/s':>9}{'peak MB':>10}{'chars':>10}{'overlap':>9}")
+    for name, result in results.items():
+        chars = sum(len(text) for text in result['outputs'].values())
+        overlap = ''
+        if baseline:
+            scores = [word_overlap(result['outputs'][page], baseline['outputs'][page]) for page in pages]
+            overlap = f"{sum(scores) / len(scores):.2f}"
+        print(f"{name:<12}{result['pages_per_sec']:>10.1f}{result['mb_per_sec']:>9.2f}"
+              f"{result['peak_mb']:>10.1f}{chars:>10}{overlap:>9}")
+
+    print("\nPer-page characters extracted:")
+    print(f"{'page':<28}" + ''.join(f"{name:>12}" for name in results))
+    for page in pages:
+        print(f"{page:<28}" + ''.join(f"{len(result['outputs'][page]):>12}" for result in results.values()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+# foia_benchmark.py
+#
+# Benchmarks the foia_search crawl offline. A local server plays search.foia.gov,
+# serving benchmarks/fixtures/foia_results.html, and one local server per agency
+# serves the result documents from benchmarks/corpus after a configurable delay.
+# The concurrent crawl is compared against fetching the same documents one at a time.
+#
+#   python benchmarks/foia_benchmark.py
+#   python benchmarks/foia_benchmark.py --latency 0.5 --max-documents 5
+
+import argparse
+import os
+import re
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import search_manager  # noqa: E402
+from search_manager import WebContentExtractor, extract_foia_result_links, foia_search  # noqa: E402
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_PATH = os.path.join(BENCHMARK_DIR, 'fixtures', 'foia_results.html')
+CORPUS_DIR = os.path.join(BENCHMARK_DIR, 'corpus')
+# Document links in the fixture, e.g. DOCS_BASE_URL/justice.gov/doc-1.html
+DOCS_LINK_PATTERN = re.compile(r'DOCS_BASE_URL/([\w.-]+)/')
+
+
+def load_documents(corpus_dir=CORPUS_DIR):
+    """Loads the corpus pages served as FOIA result documents."""
+    documents = []
+    for filename in sorted(os.listdir(corpus_dir)):
+        if filename.endswith('.html') and filename != 'js_shell.html':
+            with open(os.path.join(corpus_dir, filename), encoding='utf-8') as f:
+                documents.append(f.read().encode('utf-8'))
+    return documents
+
+
+def render_results(results_html, agency_ports):
+    """Points the fixture's document links at the local agency servers."""
+    return DOCS_LINK_PATTERN.sub(lambda m: f"http://localhost:{agency_ports[m.group(1)]}/docs/{m.group(1)}/",
+                                 results_html)
+
+
+def start_server(documents, latency, results_html=None):
+    """Starts a local server on a free port and returns it.
+
+    The server answers /search with the results page (if given) and /docs/ with
+    corpus documents after ``latency`` seconds.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith('/search') and results_html is not None:
+                body = results_html.encode('utf-8')
+            elif self.path.startswith('/docs/'):
+                time.sleep(latency)
+                body = documents[zlib.crc32(self.path.split('?')[0].encode()) % len(documents)]
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def serial_crawl(links):
+    """Fetches the documents one at a time, as foia_search used to."""
+    extractor = WebContentExtractor()
+    return [{'title': link['title'], 'url': link['url'], 'text': extractor.extract_content(link['url'])}
+            for link in links]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the foia_search crawl against a local server.")
+    parser.add_argument('--latency', type=float, default=0.3, help="Seconds the server waits before each document")
+    parser.add_argument('--max-documents', type=int, default=10, help="Result documents fetched per search")
+    parser.add_argument('--deadline', type=float, default=30, help="Fetch deadline in seconds")
+    args = parser.parse_args()
+
+    # Measure the network path, not the on-disk content cache
+    search_manager.CONTENT_CACHE_ENABLED = False
+
+    with open(FIXTURE_PATH, encoding='utf-8') as f:
+        results_html = f.read()
+    documents = load_documents()
+    # One server per agency so documents from different agencies are on different hosts
+    agency_servers = {agency: start_server(documents, args.latency)
+                      for agency in sorted(set(DOCS_LINK_PATTERN.findall(results_html)))}
+    page_html = render_results(results_html, {agency: s.server_port for agency, s in agency_servers.items()})
+    server = start_server(documents, args.latency, page_html)
+    search_url = f"http://127.0.0.1:{server.server_port}/search"
+
+    try:
+        links = extract_foia_result_links(page_html, search_url, args.max_documents)
+        print(f"Results page: {page_html.count('<a ')} links, {len(links)} result documents kept\n")
+
+        start = time.perf_counter()
+        serial_records = serial_crawl(links)
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        records = foia_search("foia annual report", max_documents=args.max_documents, deadline=args.deadline,
+                              search_url=search_url)
+        crawl_time = time.perf_counter() - start
+    finally:
+        for running in [server, *agency_servers.values()]:
+            running.shutdown()
+
+    print(f"{'mode':<12}{'seconds':>10}{'docs':>7}{'with text':>11}{'chars':>10}")
+    for mode, elapsed, result in (('serial', serial_time, serial_records), ('concurrent', crawl_time, records)):
+        print(f"{mode:<12}{elapsed:>10.2f}{len(result):>7}{sum(1 for r in result if r['text']):>11}"
+              f"{sum(len(r['text']) for r in result):>10}")
+    print(f"\nSpeedup: {serial_time / crawl_time:.1f}x")
+    print("\nDocuments:")
+    for record in records:
+        print(f"  {record['title'][:60]:<62}{len(record['text']):>8} chars  {record['url']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+# research_benchmark.py
+#
+# Compares the two ways ModelManager.perform_search turns search results into a
+# research report, without the network: one researcher call reading the pages
+# directly, and map-reduce, where every page is digested in parallel before a
+# final call synthesizes the digests. Model calls go to the FakeProvider, whose
+# latency grows with the prompt size, and a stub search manager returns
+# synthetic pages. The map-reduce run is repeated for a different request
+# over the same search results to show digest cache reuse (the response cache
+# is enabled for the map-reduce runs, in a throwaway file).
+# The fake provider charges every model the same, so the comparison is
+# conservative: real digest calls are routed to the fastest eligible model.
+#
+#   python benchmarks/research_benchmark.py
+#   python benchmarks/research_benchmark.py --queries 2 --results 8 --page-chars 10000 --prompt-cost 0.3
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import response_cache  # noqa: E402
+from models import FakeProvider, ModelManager  # noqa: E402
+
+WORDS = ("heat", "island", "urban", "temperature", "trees", "canopy", "asphalt", "albedo", "roof", "cooling",
+         "city", "night", "summer", "energy", "demand", "study", "measured", "degrees", "park", "shade", "policy",
+         "surface", "air", "wind", "building", "density", "green", "water", "health", "risk", "the", "of", "and")
+
+
+class StubSearchManager:
+    """Returns the same synthetic, distinct pages for a query every time."""
+
+    def __init__(self, results: int, page_chars: int):
+        self.results = results
+        self.page_chars = page_chars
+
+    def search_many(self, queries, num_results=None):
+        results_by_query = {}
+        for query in queries:
+            results = []
+            for index in range(self.results):
+                rng = random.Random(f"{query}/{index}")
+                words, size = [], 0
+                while size < self.page_chars:
+                    words.append(rng.choice(WORDS))
+                    size += len(words[-1]) + 1
+                results.append({'title': f"{query} source {index + 1}",
+                                'url': f"https://example.com/{query.replace(' ', '-')}/{index}",
+                                'content': " ".join(words)})
+            results_by_query[query] = results
+        return results_by_query
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark single-call versus map-reduce research synthesis.")
+    parser.add_argument('--queries', type=int, default=2, help="Search queries per request")
+    parser.add_argument('--results', type=int, default=8, help="Pages per query")
+    parser.add_argument('--page-chars', type=int, default=10000, help="Characters of content per page")
+    parser.add_argument('--latency', type=float, default=0.5, help="Seconds before each call's first token")
+    parser.add_argument('--prompt-cost', type=float, default=0.3, help="Fake seconds per 1k prompt tokens")
+    parser.add_argument('--tokens-per-second', type=float, default=200, help="Fake model output rate")
+    parser.add_argument('--output-tokens', type=int, default=200, help="Tokens per fake answer")
+    parser.add_argument('--log-level', default='ERROR', help="Logging level while the workload runs")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(args.log_level.upper())
+
+    cache_dir = tempfile.mkdtemp(prefix="research_benchmark_")
+    # Responses go to a throwaway cache so earlier runs cannot warm it
+    response_cache._shared_cache = response_cache.ResponseCache(os.path.join(cache_dir, "responses.sqlite3"))
+    search = StubSearchManager(args.results, args.page_chars)
+    queries = [f"urban heat island mitigation {index + 1}" for index in range(args.queries)]
+
+    def run(label, map_reduce, prompt):
+        provider = FakeProvider(latency=args.latency, tokens_per_second=args.tokens_per_second,
+                                output_tokens=args.output_tokens, seconds_per_1k_prompt_tokens=args.prompt_cost)
+        manager = ModelManager(search_enabled=False, cache_responses=map_reduce, provider=provider, routing=False,
+                               map_reduce_research=map_reduce)
+        start = time.perf_counter()
+        report = manager.perform_search([], "", queries, search, prompt)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<24} {elapsed:>6.2f}s  {provider.calls:>3} model calls  {len(report):>6} chars")
+        return elapsed
+
+    print(f"{args.queries} queries x {args.results} pages of {args.page_chars} chars\n")
+    single = run("single researcher call", False, "Summarize how cities reduce heat islands")
+    cold = run("map-reduce (cold)", True, "Summarize how cities reduce heat islands")
+    warm = run("map-reduce (cached)", True, "Which heat island measures cost the least?")
+    stats = response_cache.get_response_cache().get_stats()
+    print(f"\nspeedup  cold {single / cold:.1f}x  cached {single / warm:.1f}x  "
+          f"response cache hits {stats['hits']}  misses {stats['misses']}")
+
+
+if __name__ == '__main__':
+    main()
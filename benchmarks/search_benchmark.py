@@ -0,0 +1,273 @@
+# search_benchmark.py
+#
+# End-to-end benchmark of SearchManager.search without the network. Local
+# stand-ins replace the providers and the open web:
+#   - a fake search API answering Google-style ("items") or Brave-style ("results")
+#     payloads whose links point at the fake web servers, and
+#   - fake web servers (one per simulated host) serving the pages in
+#     benchmarks/corpus with configurable latency, error rate and page size.
+# The Selenium fallback is disabled unless --selenium is given.
+# A workload of queries is run sequentially or concurrently and the per-search
+# latency percentiles, throughput and memory are reported. With --max-p95 the
+# script exits non-zero when the p95 latency regresses past the given budget.
+#
+#   python benchmarks/search_benchmark.py
+#   python benchmarks/search_benchmark.py --concurrency 16 --queries 64 --latency 0.2 --error-rate 0.05
+#   python benchmarks/search_benchmark.py --payload results --page-kb 512 --repeat 3 --max-p95 2.0
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import search_manager  # noqa: E402
+from content_cache import ContentCache  # noqa: E402
+from extraction_benchmark import CORPUS_DIR, load_corpus  # noqa: E402
+from http_client import get_async_http_client  # noqa: E402
+from rate_limiter import QuotaTracker  # noqa: E402
+from search_manager import SearchAPI, SearchManager, SearchProvider, WebContentExtractor  # noqa: E402
+
+
+class OfflineProvider(SearchProvider):
+    """Last-resort provider that never reaches the network."""
+
+    def search(self, query, num_results):
+        return []
+
+
+def start_server(handler_class, **attributes):
+    """Starts a keep-alive HTTP server on a free local port and returns it."""
+    handler = type(handler_class.__name__, (handler_class,), attributes)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class QuietHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def send_body(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeWebHandler(QuietHandler):
+    """Serves corpus pages at /page/<n> after a delay, failing a fraction of requests with 503."""
+
+    pages = []
+    latency = 0.0
+    jitter = 0.0
+    error_rate = 0.0
+    rng = random.Random(0)
+
+    def do_GET(self):
+        time.sleep(max(self.latency + self.rng.uniform(-self.jitter, self.jitter), 0))
+        if self.rng.random() < self.error_rate:
+            self.send_body(503, 'text/plain', b'unavailable')
+            return
+        page = self.pages[zlib.crc32(self.path.encode()) % len(self.pages)]
+        self.send_body(200, 'text/html; charset=utf-8', page)
+
+
+class FakeSearchHandler(QuietHandler):
+    """Answers searches with links spread over the fake web hosts.
+
+    The same query always gets the same links. ``overlap`` is the fraction of
+    links drawn from a small shared pool, so different queries share pages.
+    """
+
+    hosts = []
+    payload = 'items'
+    latency = 0.0
+    overlap = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        params = parse_qs(urlparse(self.path).query)
+        query = params.get('q', [''])[0]
+        count = int(params.get('num', ['10'])[0])
+        rng = random.Random(query)
+        results = []
+        for i in range(count):
+            page_id = f"shared-{rng.randrange(20)}" if rng.random() < self.overlap else f"{query}-{i}"
+            host = self.hosts[zlib.crc32(page_id.encode()) % len(self.hosts)]
+            url = f"{host}/page/{zlib.crc32(page_id.encode())}"
+            results.append({'link' if self.payload == 'items' else 'url': url,
+                            'title': f"Result {i} for {query}", 'snippet': f"Snippet {i} for {query}"})
+        self.send_body(200, 'application/json', json.dumps({self.payload: results}).encode('utf-8'))
+
+
+def load_pages(page_kb):
+    """Loads the corpus pages, padding each to at least ``page_kb`` KB with extra paragraphs."""
+    pages = []
+    for html in load_corpus(CORPUS_DIR, large_page_kb=0).values():
+        if page_kb and len(html) < page_kb * 1024:
+            filler = '<p>Additional filler paragraph with ordinary words about the topic at hand.</p>'
+            padding = filler * ((page_kb * 1024 - len(html)) // len(filler) + 1)
+            html = html.replace('</body>', f"<div class=\"content\">{padding}</div></body>")
+        pages.append(html.encode('utf-8'))
+    return pages
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    index = max(int(len(ordered) * pct / 100 + 0.5) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def build_workload(queries, repeat, seed=0):
+    """Returns the query list: ``queries`` distinct queries, each asked ``repeat`` times, shuffled."""
+    workload = [f"benchmark query {i}" for i in range(queries)] * repeat
+    random.Random(seed).shuffle(workload)
+    return workload
+
+
+async def run_concurrent(manager, workload, num_results, concurrency):
+    """Runs the workload with up to ``concurrency`` searches in flight; returns per-search latencies."""
+    slots = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(query):
+        async with slots:
+            start = time.perf_counter()
+            results = await manager.asearch(query, num_results)
+            latencies.append((time.perf_counter() - start, len(results)))
+
+    await asyncio.gather(*(one(query) for query in workload))
+    return latencies
+
+
+def run_sequential(manager, workload, num_results):
+    """Runs the workload one blocking search at a time; returns per-search latencies."""
+    latencies = []
+    for query in workload:
+        start = time.perf_counter()
+        results = manager.search(query, num_results)
+        latencies.append((time.perf_counter() - start, len(results)))
+    return latencies
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return float('nan')
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SearchManager.search against local stand-ins.")
+    parser.add_argument('--queries', type=int, default=32, help="Distinct queries in the workload")
+    parser.add_argument('--repeat', type=int, default=1, help="Times each query is asked (repeats hit the cache)")
+    parser.add_argument('--results', type=int, default=5, help="Results requested per search")
+    parser.add_argument('--concurrency', type=int, default=8, help="Searches in flight (1 runs the sync API)")
+    parser.add_argument('--payload', choices=['items', 'results'], default='items',
+                        help="Search API payload shape (Google 'items' or Brave 'results')")
+    parser.add_argument('--api-latency', type=float, default=0.05, help="Seconds the search API takes to answer")
+    parser.add_argument('--hosts', type=int, default=8, help="Number of simulated web hosts")
+    parser.add_argument('--latency', type=float, default=0.1, help="Mean seconds a web server takes per page")
+    parser.add_argument('--jitter', type=float, default=0.05, help="Uniform +/- jitter on page latency")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of page requests answered with 503")
+    parser.add_argument('--page-kb', type=int, default=0, help="Pad every page to at least this size")
+    parser.add_argument('--overlap', type=float, default=0.2, help="Fraction of links shared between queries")
+    parser.add_argument('--content-cache', action='store_true', help="Enable the on-disk content cache")
+    parser.add_argument('--selenium', action='store_true',
+                        help="Let JavaScript-only pages fall back to a real headless browser")
+    parser.add_argument('--trace-memory', action='store_true', help="Measure peak Python heap with tracemalloc")
+    parser.add_argument('--max-p95', type=float, help="Exit with status 1 if p95 latency exceeds this many seconds")
+    parser.add_argument('--log-level', default='ERROR', help="Logging level while the workload runs")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(args.log_level.upper())
+
+    temp_dir = tempfile.mkdtemp(prefix='search_benchmark_')
+    pages = load_pages(args.page_kb)
+    web_servers = [start_server(FakeWebHandler, pages=pages, latency=args.latency, jitter=args.jitter,
+                                error_rate=args.error_rate, rng=random.Random(i))
+                   for i in range(args.hosts)]
+    hosts = [f"http://127.0.0.1:{server.server_port}" for server in web_servers]
+    api_server = start_server(FakeSearchHandler, hosts=hosts, payload=args.payload, latency=args.api_latency,
+                              overlap=args.overlap)
+
+    # Keep quota counters and cached pages out of the real cache directory
+    api = SearchAPI("Google", "benchmark", f"http://127.0.0.1:{api_server.server_port}/search", {},
+                    float('inf'), args.payload, 0)
+    api.quota_tracker = QuotaTracker(os.path.join(temp_dir, 'quota.json'))
+    search_manager.CONTENT_CACHE_ENABLED = args.content_cache
+    if not args.selenium:
+        # Offline there is no browser to start; JavaScript-only pages come back empty instead
+        WebContentExtractor.extract_with_selenium = classmethod(lambda cls, url: "")
+    if args.content_cache:
+        WebContentExtractor._cache = ContentCache(os.path.join(temp_dir, 'content.sqlite3'))
+    manager = SearchManager([api], OfflineProvider())
+    workload = build_workload(args.queries, args.repeat)
+
+    if args.trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        if args.concurrency > 1:
+            latencies = asyncio.run(run_concurrent(manager, workload, args.results, args.concurrency))
+        else:
+            latencies = run_sequential(manager, workload, args.results)
+    finally:
+        elapsed = time.perf_counter() - start
+        heap_peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024 if args.trace_memory else None
+        tracemalloc.stop()
+        for server in [api_server, *web_servers]:
+            server.shutdown()
+        if WebContentExtractor._cache is not None:
+            content_stats = WebContentExtractor._cache.get_stats()
+            WebContentExtractor._cache.close()
+            WebContentExtractor._cache = None
+        else:
+            content_stats = None
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    times = [latency for latency, _ in latencies]
+    results = sum(count for _, count in latencies)
+    print(f"{len(workload)} searches ({args.queries} distinct), concurrency {args.concurrency}, "
+          f"{args.hosts} hosts, {len(pages)} corpus pages\n")
+    print(f"latency  p50 {percentile(times, 50):.3f}s  p95 {percentile(times, 95):.3f}s  "
+          f"p99 {percentile(times, 99):.3f}s  max {max(times):.3f}s")
+    print(f"throughput  {len(workload) / elapsed:.1f} searches/s  {results / elapsed:.1f} results/s  "
+          f"({elapsed:.2f}s total)")
+    memory = f"memory  peak RSS {peak_rss_mb():.0f} MB"
+    if heap_peak is not None:
+        memory += f"  peak Python heap {heap_peak:.1f} MB"
+    print(memory)
+    print(f"empty searches  {sum(1 for _, count in latencies if not count)}")
+    print(f"query cache  {manager.cache.get_stats()}")
+    if content_stats:
+        print(f"content cache  {content_stats}")
+    print(f"http  {get_async_http_client().get_metrics()}")
+
+    if args.max_p95 is not None and percentile(times, 95) > args.max_p95:
+        print(f"\nFAIL: p95 latency {percentile(times, 95):.3f}s exceeds the {args.max_p95}s budget")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+# startup_benchmark.py
+#
+# Cold-start budget check for the app entry point. Each run imports the target
+# modules in a fresh interpreter and measures the time until the import
+# finishes and, with --paint, until a first Tk window has been drawn. The
+# script fails (exit status 1) if the median exceeds --max-seconds or if any of
+# the heavy dependencies that should load on first use was imported at startup.
+#
+# tests/test_startup.py runs the same check under pytest.
+#
+#   python benchmarks/startup_benchmark.py
+#   python benchmarks/startup_benchmark.py --module models --max-seconds 0.4
+#   python benchmarks/startup_benchmark.py --paint --top 15
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must not be imported until a feature that needs them is used
+HEAVY_MODULES = ('selenium', 'webdriver_manager', 'newspaper', 'duckduckgo_search', 'fake_useragent', 'html2text',
+                 'bs4', 'google.generativeai')
+# The modules the app's UI and agents load at startup
+DEFAULT_MODULES = ['models', 'search_manager']
+
+CHILD_SCRIPT = """
+import importlib, json, sys, time
+start = time.perf_counter()
+for module in sys.argv[2:]:
+    importlib.import_module(module)
+imported = time.perf_counter() - start
+painted = None
+if sys.argv[1] == "paint":
+    import tkinter as tk
+    root = tk.Tk()
+    root.update()
+    painted = time.perf_counter() - start
+    root.destroy()
+heavy = json.loads(sys.stdin.read())
+print(json.dumps({"imported": imported, "painted": painted, "heavy": [m for m in heavy if m in sys.modules]}))
+"""
+
+
+def measure(modules, paint):
+    """Imports the modules in a fresh interpreter and returns its timings."""
+    completed = subprocess.run([sys.executable, '-c', CHILD_SCRIPT, 'paint' if paint else 'import', *modules],
+                               input=json.dumps(HEAVY_MODULES), capture_output=True, text=True, cwd=ROOT_DIR)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "failed")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def import_time_offenders(modules, top):
+    """Returns the ``top`` slowest imports (cumulative microseconds, module) from python -X importtime."""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {', '.join(modules)}"],
+                               capture_output=True, text=True, cwd=ROOT_DIR)
+    rows = []
+    for line in completed.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]), parts[2].strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the cold-start time of the app against a budget.")
+    parser.add_argument('--module', action='append',
+                        help=f"Module to import (repeatable, default: {' '.join(DEFAULT_MODULES)})")
+    parser.add_argument('--runs', type=int, default=5, help="Fresh interpreters to measure")
+    parser.add_argument('--paint', action='store_true', help="Also create a Tk window and wait for its first draw")
+    parser.add_argument('--max-seconds', type=float, default=0.5, help="Budget for the median cold start")
+    parser.add_argument('--top', type=int, default=10, help="Slowest imports to list")
+    args = parser.parse_args()
+    modules = args.module or DEFAULT_MODULES
+
+    try:
+        runs = [measure(modules, args.paint) for _ in range(args.runs)]
+    except RuntimeError as e:
+        print(f"Importing {', '.join(modules)} failed: {e}")
+        sys.exit(2)
+
+    key = 'painted' if args.paint else 'imported'
+    times = [run[key] for run in runs]
+    median = statistics.median(times)
+    print(f"cold start of {', '.join(modules)} ({key}), {args.runs} runs: median {median:.3f}s  "
+          f"min {min(times):.3f}s  max {max(times):.3f}s")
+    print("\nslowest imports (cumulative):")
+    for micros, module in import_time_offenders(modules, args.top):
+        print(f"  {micros / 1000:>8.1f} ms  {module}")
+
+    failures = []
+    if median > args.max_seconds:
+        failures.append(f"median cold start {median:.3f}s exceeds the {args.max_seconds}s budget")
+    if heavy := sorted({module for run in runs for module in run['heavy']}):
+        failures.append(f"heavy modules imported at startup: {', '.join(heavy)}")
+    for failure in failures:
+        print(f"\nFAIL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+# browser_pool.py
+
+import atexit
+import logging
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+
+from selenium import webdriver
+from selenium.common.exceptions import InvalidSessionIdException, TimeoutException, WebDriverException
+from selenium.webdriver.edge.options import Options
+from selenium.webdriver.edge.service import Service
+from selenium.webdriver.support.ui import WebDriverWait
+from webdriver_manager.microsoft import EdgeChromiumDriverManager
+
+from config import BROWSER_POOL_SIZE, BROWSER_MAX_USES, BROWSER_PAGE_TIMEOUT, BROWSER_NETWORK_IDLE_TIME
+from retry import DeadlineExceeded, check_deadline, deadline_timeout
+
+logger = logging.getLogger(__name__)
+
+# Counts resources the page has started loading; stable for a while means the network is idle
+RESOURCE_COUNT_SCRIPT = "return window.performance.getEntriesByType('resource').length"
+
+
+class BrowserWorker:
+    """A long-lived headless Edge browser and the number of pages it has loaded."""
+
+    def __init__(self, driver: webdriver.Edge):
+        self.driver = driver
+        self.uses = 0
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting browser: {e}")
+
+
+class BrowserPool:
+    """Pool of reusable headless browsers for rendering JavaScript-heavy pages.
+
+    Browsers are started lazily up to ``size``, checked out one page load at a
+    time with ``page()``, and replaced after ``max_uses`` page loads or once
+    their session has died. A page that fails to load (e.g. an unresolvable
+    host) leaves the browser in the pool. ``shutdown()`` runs automatically when
+    the process exits.
+    """
+
+    def __init__(self, user_agents: List[str], size: int = BROWSER_POOL_SIZE, max_uses: int = BROWSER_MAX_USES,
+                 page_timeout: float = BROWSER_PAGE_TIMEOUT):
+        self.user_agents = user_agents
+        self.size = size
+        self.max_uses = max_uses
+        self.page_timeout = page_timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._workers: List[BrowserWorker] = []
+        self._driver_path: Optional[str] = None
+        self._closed = False
+        atexit.register(self.shutdown)
+
+    def _start_worker(self) -> BrowserWorker:
+        """Launches a new headless browser."""
+        with self._lock:
+            if self._driver_path is None:
+                # Resolve (and download if needed) the driver once for the whole pool
+                self._driver_path = EdgeChromiumDriverManager().install()
+            driver_path = self._driver_path
+
+        edge_options = Options()
+        edge_options.add_argument("--headless=new")
+        edge_options.add_argument("--disable-gpu")
+        edge_options.add_argument("--no-sandbox")
+        edge_options.add_argument(f"user-agent={random.choice(self.user_agents)}")
+        edge_options.page_load_strategy = 'eager'
+
+        driver = webdriver.Edge(service=Service(driver_path), options=edge_options)
+        driver.set_page_load_timeout(self.page_timeout)
+        worker = BrowserWorker(driver)
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+
+    def _retire(self, worker: BrowserWorker):
+        """Quits a worker and forgets about it."""
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        worker.quit()
+
+    @staticmethod
+    def _is_alive(worker: BrowserWorker) -> bool:
+        """Checks that the worker's browser session still answers commands."""
+        try:
+            worker.driver.execute_script("return 1")
+            return True
+        except WebDriverException:
+            return False
+
+    def _check_in(self, worker: BrowserWorker):
+        """Counts a page load and returns the worker to the pool, or retires it once it is used up."""
+        worker.uses += 1
+        if self._closed or worker.uses >= self.max_uses:
+            self._retire(worker)
+        else:
+            self._idle.put(worker)
+
+    @contextmanager
+    def page(self):
+        """Checks out a browser for one page load.
+
+        Waiting for a free browser is bounded by the request deadline.
+
+        Yields:
+            webdriver.Edge: The driver to load the page with.
+
+        Raises:
+            RuntimeError: If the pool has been shut down.
+            DeadlineExceeded: If the request deadline passes before a browser is free.
+        """
+        if self._closed:
+            raise RuntimeError("Browser pool has been shut down")
+        check_deadline("waiting for a browser")
+        if not self._slots.acquire(timeout=deadline_timeout(None)):
+            raise DeadlineExceeded("Request deadline passed while waiting for a browser")
+        worker = None
+        try:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                worker = self._start_worker()
+            yield worker.driver
+            self._check_in(worker)
+        except DeadlineExceeded:
+            # Running out of time says nothing about the browser, so it goes back to the pool
+            if worker is not None:
+                self._check_in(worker)
+            raise
+        except Exception as e:
+            # Navigation errors are common here and leave the browser usable; replace only a dead session
+            if worker is not None:
+                if isinstance(e, InvalidSessionIdException) or not self._is_alive(worker):
+                    self._retire(worker)
+                else:
+                    self._check_in(worker)
+            raise
+        except BaseException:
+            if worker is not None:
+                self._retire(worker)
+            raise
+        finally:
+            self._slots.release()
+
+    def wait_until_ready(self, driver: webdriver.Edge, timeout: Optional[float] = None):
+        """Waits for the DOM to be ready and then for the network to go idle.
+
+        The network counts as idle once no new resources have started loading for
+        BROWSER_NETWORK_IDLE_TIME seconds. Gives up silently after ``timeout``.
+        """
+        deadline = time.monotonic() + (self.page_timeout if timeout is None else timeout)
+        try:
+            WebDriverWait(driver, max(deadline - time.monotonic(), 0.1), poll_frequency=0.1).until(
+                lambda d: d.execute_script("return document.readyState") in ('interactive', 'complete'))
+            resource_count = driver.execute_script(RESOURCE_COUNT_SCRIPT)
+            idle_since = time.monotonic()
+            while time.monotonic() < deadline:
+                time.sleep(0.1)
+                current_count = driver.execute_script(RESOURCE_COUNT_SCRIPT)
+                if current_count != resource_count:
+                    resource_count, idle_since = current_count, time.monotonic()
+                elif time.monotonic() - idle_since >= BROWSER_NETWORK_IDLE_TIME:
+                    return
+        except TimeoutException:
+            logger.warning("Timed out waiting for page to become ready")
+        except WebDriverException as e:
+            logger.warning(f"Error while waiting for page readiness: {e}")
+
+    def shutdown(self):
+        """Quits every browser in the pool. Safe to call more than once."""
+        self._closed = True
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.quit()
+        while not self._idle.empty():
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
@@ -12,18 +12,153 @@ GOOGLE_CUSTOM_SEARCH_API_KEY = os.getenv('GOOGLE_CUSTOM_SEARCH_API_KEY')
 GOOGLE_CUSTOM_SEARCH_ENGINE_ID = os.getenv('GOOGLE_CUSTOM_SEARCH_ENGINE_ID')
 BRAVE_SEARCH_API_KEY = os.getenv('BRAVE_SEARCH_API_KEY')
 HF_TOKEN = os.getenv('HF_TOKEN')
+LOCAL_LLM_API_KEY = os.getenv('LOCAL_LLM_API_KEY')
 
 # Constants
 MAX_CHAT_HISTORY_LENGTH = 14
-MAX_RETRIES = 3
-BACKOFF_FACTOR = 2
+MAX_RETRIES = 3  # Attempts per call (the first try included) under the shared retry policy
+BACKOFF_FACTOR = 2  # Multiplier between successive retry delays
 MAX_TRUNCATE_LENGTH = 5000  # Length of truncated chat_log items
 MAX_INVALID_ATTEMPTS = 3
 MAX_SEARCH_RESULTS = 8
 MAX_CONTENT_LENGTH = 4000  # Maximum number of characters to extract from each webpage
-TIMEOUT = 15
+TIMEOUT = 15  # Seconds allowed for a single search API request
 MAX_SEARCH_QUERIES_PER_REQUEST = 2
 
+# Concurrent page fetching
+FETCH_MAX_WORKERS = 8  # Maximum number of pages fetched at once per search
+FETCH_PER_HOST_LIMIT = 2  # Maximum number of concurrent fetches against a single host
+FETCH_DEADLINE = 30  # Wall-clock seconds allowed for fetching all pages of one search
+
+# FOIA search tool
+FOIA_SEARCH_URL = "https://search.foia.gov/search"
+FOIA_MAX_DOCUMENTS = 10  # Maximum number of result documents fetched per FOIA search
+FOIA_DEADLINE = 30  # Wall-clock seconds allowed for fetching the documents of one FOIA search
+
+# Hedged search: race the next provider when the current one is slower than usual
+SEARCH_HEDGED = False
+SEARCH_HEDGE_PERCENTILE = 90  # Latency percentile of a provider after which the next provider is started
+SEARCH_HEDGE_DEFAULT_DELAY = 2.0  # Seconds to wait before hedging while a provider has too few latency samples
+SEARCH_HEDGE_MIN_SAMPLES = 5
+
+# Search API rate limiting and quotas
+SEARCH_RATE_BURST = 2  # Requests a search API may send back to back before its rate limit applies
+QUOTA_STATE_PATH = "cache/search_quota.json"  # Daily request counters, persisted across restarts
+
+# Circuit breakers for search providers and page domains
+BREAKER_FAILURE_THRESHOLD = 3  # Consecutive failures that open a circuit
+BREAKER_ERROR_RATE = 0.5  # Error rate over the recent window that opens a circuit
+BREAKER_WINDOW = 20  # Number of recent calls the error rate is computed over
+BREAKER_MIN_SAMPLES = 5  # Calls needed before the error rate is considered
+BREAKER_COOLDOWN = 30  # Seconds a circuit stays open before a probe call is allowed
+BREAKER_MAX_COOLDOWN = 600  # Upper bound for the cooldown, which doubles after each failed probe
+
+# Duplicate search result removal
+DEDUP_SHINGLE_SIZE = 3  # Words per shingle when fingerprinting page content
+DEDUP_MAX_HAMMING_DISTANCE = 3  # SimHash bit differences (of 64) at or below which pages count as near-duplicates
+
+# Query-aware passage selection
+PASSAGE_CHARS = 600  # Target size of the passages pages are split into for ranking
+PASSAGE_CANDIDATE_CHARS = 40000  # Characters extracted per page to choose passages from
+RESEARCH_CONTEXT_CHARS = 24000  # Characters of page content per query sent to the researcher
+
+# Map-reduce research (opt-in): each page is digested against its query on a fast model, then one call synthesizes
+# the digests. Costs one extra model call per page. Digests are cached in the response cache when
+# RESPONSE_CACHE_ENABLED is on.
+RESEARCH_MAP_REDUCE = False
+RESEARCH_DIGEST_PAGE_CHARS = 10000  # Characters of each page (its best passages for the query) sent to a digest call
+# Digest calls in flight at once across the whole process; keep it within the model provider's concurrency and
+# requests-per-minute limits. Each request digests all its pages at once up to this limit.
+RESEARCH_DIGEST_MAX_WORKERS = 16
+
+# Shared HTTP client
+HTTP_POOL_CONNECTIONS = 32  # Number of per-host connection pools kept alive
+HTTP_POOL_MAXSIZE = 4  # Maximum number of keep-alive connections per host
+HTTP2_ENABLED = False  # Use HTTP/2 (requires httpx[http2])
+
+# Persistent page content cache
+CONTENT_CACHE_ENABLED = True
+CONTENT_CACHE_PATH = "cache/content_cache.sqlite3"
+CONTENT_CACHE_MAX_BYTES = 256 * 1024 * 1024  # Compressed bytes stored before LRU eviction
+CONTENT_CACHE_DEFAULT_TTL = 24 * 60 * 60  # Seconds a page stays fresh when the server gives no caching headers
+
+# In-memory search result cache
+QUERY_CACHE_MAX_BYTES = 32 * 1024 * 1024  # Total size of cached result lists before LRU eviction
+QUERY_CACHE_TTL = 60 * 60  # Seconds cached results are served as fresh
+QUERY_CACHE_STALE_TTL = 6 * 60 * 60  # Extra seconds stale results are served while refreshing in the background
+
+# Headless browser pool (Selenium fallback)
+BROWSER_POOL_SIZE = 2  # Maximum number of concurrently running browsers
+BROWSER_MAX_USES = 50  # Page loads before a browser is recycled
+BROWSER_PAGE_TIMEOUT = 15  # Seconds allowed for a page to load and settle
+BROWSER_NETWORK_IDLE_TIME = 0.5  # Seconds without new network requests before a page counts as loaded
+
+# Persistent model response cache (opt-in)
+RESPONSE_CACHE_ENABLED = False
+RESPONSE_CACHE_PATH = "cache/response_cache.sqlite3"
+RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024  # Compressed bytes stored before LRU eviction
+RESPONSE_CACHE_TTL = 7 * 24 * 60 * 60  # Seconds a cached response is reused
+RESPONSE_CACHE_MAX_TEMPERATURE = 0.3  # Agents at or below this temperature are cached
+RESPONSE_CACHE_PINNED_MODELS = ()  # Model types cached regardless of temperature, e.g. ("critic",)
+
+# Multi-agent workflows
+WORKFLOW_MAX_PARALLELISM = 4  # Agent steps running at the same time
+
+# Conversation context sent to the models
+CONTEXT_TOKEN_BUDGETS = {  # Estimated tokens of conversation and prompt per call, by model type
+    "writer": 32000,
+    "default": 8000,
+}
+CONTEXT_SUMMARY_MAX_TOKENS = 1000  # Size of the running summary of turns dropped from the chat history
+CONTEXT_SUMMARY_LINE_CHARS = 300  # Characters of each dropped turn kept in the summary
+
+# LLM providers
+LLM_PROVIDER = "gemini"  # "gemini", "openai" (any OpenAI-compatible server, e.g. Ollama or llama.cpp) or "fake"
+LOCAL_LLM_BASE_URL = "http://localhost:11434/v1"  # Ollama; llama.cpp's server listens on http://localhost:8080/v1
+LOCAL_LLM_MODEL = "llama3.1"  # Model used for every role unless mapped otherwise
+LOCAL_LLM_TIMEOUT = 300  # Seconds allowed for one completion
+FAKE_LLM_LATENCY = 0.3  # Seconds before the fake provider's first token
+FAKE_LLM_TOKENS_PER_SECOND = 200  # Fake provider output rate after the first token
+FAKE_LLM_OUTPUT_TOKENS = 300  # Length of the fake provider's answers
+FAKE_LLM_SECONDS_PER_1K_PROMPT_TOKENS = 0.0  # Extra fake latency for reading the prompt
+
+# Model routing: each call goes to the fastest healthy model that meets the role's quality floor
+MODEL_ROUTING_ENABLED = True
+MODEL_ROUTER_MODELS = {  # quality rank, context window, and latency priors used until enough calls are measured
+    "models/gemini-1.5-pro-latest": {"quality": 3, "context_tokens": 2000000, "base_latency": 3.0,
+                                     "seconds_per_1k_tokens": 0.3},
+    "models/gemini-1.5-flash-latest": {"quality": 2, "context_tokens": 1000000, "base_latency": 1.0,
+                                       "seconds_per_1k_tokens": 0.08},
+    "models/gemini-1.5-flash-8b-latest": {"quality": 1, "context_tokens": 1000000, "base_latency": 0.6,
+                                          "seconds_per_1k_tokens": 0.04},
+}
+MODEL_ROUTER_QUALITY_FLOORS = {  # Minimum model quality per role
+    "writer": 3,
+    "brainstorm": 2,
+    "critic": 2,
+    "default": 2,
+}
+MODEL_ROUTER_SHORT_PROMPT_FLOORS = {  # Lower floors for roles whose short prompts a small model handles well
+    "digest": 1,
+    "director": 1,
+    "prompter": 1,
+}
+MODEL_ROUTER_SHORT_PROMPT_TOKENS = 4000  # Prompts up to this many estimated tokens count as short
+MODEL_ROUTER_WINDOW = 20  # Recent calls per model the latency estimate is fitted to
+MODEL_ROUTER_MIN_SAMPLES = 3  # Calls needed before measurements replace the priors
+MODEL_ROUTER_RECENCY_DECAY = 0.7  # Weight of each latency sample relative to the next newer one
+MODEL_ROUTER_SAMPLE_TTL = 300  # Seconds a latency sample counts, so a model that slowed down gets retried
+
+# Retries and deadlines
+RETRY_BASE_DELAY = 0.5  # Seconds before the first retry; later retries back off by BACKOFF_FACTOR, with full jitter
+RETRY_MAX_DELAY = 8  # Upper bound on a single retry delay
+REQUEST_DEADLINE = 180  # Seconds allowed for one user request: search, fetches, browser and model calls together
+MODEL_CALL_TIMEOUT = 120  # Seconds allowed for a single model call
+BROWSER_MIN_TIME = 3  # Seconds that must remain before the deadline to fall back to the browser
+
+# HTML-to-text extraction backend: "selectolax", "lxml" or "html2text" (falls back in that order if not installed)
+EXTRACTION_BACKEND = "lxml"
+
 # Safety Settings
 SAFETY_SETTINGS = [
     {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
@@ -0,0 +1,160 @@
+# content_cache.py
+
+import json
+import logging
+import re
+import threading
+import time
+import zlib
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from config import CONTENT_CACHE_PATH, CONTENT_CACHE_MAX_BYTES, CONTENT_CACHE_DEFAULT_TTL
+from http_client import normalize_url
+from sqlite_store import SQLiteLRUStore
+
+logger = logging.getLogger(__name__)
+
+# Response headers kept alongside each cached page
+STORED_HEADERS = ('content-type', 'etag', 'last-modified', 'cache-control', 'expires')
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[float]:
+    """Parses an HTTP date header into a Unix timestamp."""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parses a Cache-Control header into a dict of lowercase directives."""
+    directives = {}
+    for part in (value or '').split(','):
+        name, _, arg = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = arg.strip('"') or None
+    return directives
+
+
+class CachedPage:
+    """A page stored in the content cache."""
+
+    def __init__(self, url: str, headers: Dict[str, str], body: bytes, text: str, stored_at: float,
+                 expires_at: float):
+        self.url = url
+        self.headers = headers
+        self.body = body
+        self.text = text
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+
+    def is_fresh(self) -> bool:
+        """Checks if the page can be served without revalidating it."""
+        return time.time() < self.expires_at
+
+    def must_revalidate(self) -> bool:
+        """Checks if the origin forbids serving the page once it is stale."""
+        directives = parse_cache_control(self.headers.get('cache-control'))
+        return 'must-revalidate' in directives or 'no-cache' in directives
+
+    def validators(self) -> Dict[str, str]:
+        """Returns the conditional request headers for revalidating the page."""
+        headers = {}
+        if etag := self.headers.get('etag'):
+            headers['If-None-Match'] = etag
+        if last_modified := self.headers.get('last-modified'):
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+
+class ContentCache:
+    """Disk-backed (SQLite) cache of fetched pages and their extracted text.
+
+    Entries are keyed by normalized URL and hold the compressed raw body and
+    extracted text. Freshness follows the response's Cache-Control/Expires
+    headers, stale entries are revalidated with ETag/Last-Modified, and the
+    least recently used entries are evicted once the total stored size exceeds
+    ``max_bytes``.
+    """
+
+    def __init__(self, path: str = CONTENT_CACHE_PATH, max_bytes: int = CONTENT_CACHE_MAX_BYTES,
+                 default_ttl: float = CONTENT_CACHE_DEFAULT_TTL):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._lock = threading.Lock()
+        self._store = SQLiteLRUStore(path, "pages", {'url': "TEXT", 'headers': "TEXT", 'body': "BLOB",
+                                                     'text': "BLOB", 'stored_at': "REAL", 'expires_at': "REAL"},
+                                     max_bytes)
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Returns the cached page for a URL (fresh or stale), or None."""
+        row = self._store.get(normalize_url(url), ('url', 'headers', 'body', 'text', 'stored_at', 'expires_at'))
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        url, headers, body, text, stored_at, expires_at = row
+        return CachedPage(url, json.loads(headers), zlib.decompress(body), zlib.decompress(text).decode('utf-8'),
+                          stored_at, expires_at)
+
+    def store(self, url: str, headers: Dict[str, str], body: bytes, text: str):
+        """Stores a fetched page unless its Cache-Control forbids it."""
+        headers = {name.lower(): value for name, value in headers.items() if name.lower() in STORED_HEADERS}
+        directives = parse_cache_control(headers.get('cache-control'))
+        if 'no-store' in directives:
+            return
+
+        now = time.time()
+        compressed_body = zlib.compress(body)
+        compressed_text = zlib.compress(text.encode('utf-8'))
+        self._store.put(normalize_url(url), len(compressed_body) + len(compressed_text), {
+            'url': url, 'headers': json.dumps(headers), 'body': compressed_body, 'text': compressed_text,
+            'stored_at': now, 'expires_at': self._expires_at(headers, now),
+        })
+
+    def revalidated(self, url: str, headers: Dict[str, str]):
+        """Refreshes a cached page's freshness after a 304 Not Modified response."""
+        key = normalize_url(url)
+        row = self._store.get(key, ('headers',), touch=False)
+        if row is None:
+            return
+        stored = json.loads(row[0])
+        stored.update({name.lower(): value for name, value in headers.items() if name.lower() in STORED_HEADERS})
+        self._store.update(key, {'headers': json.dumps(stored), 'expires_at': self._expires_at(stored, time.time())})
+        with self._lock:
+            self.revalidations += 1
+
+    def _expires_at(self, headers: Dict[str, str], now: float) -> float:
+        """Computes when a response becomes stale from its caching headers."""
+        directives = parse_cache_control(headers.get('cache-control'))
+        if 'no-cache' in directives:
+            return now
+        if (max_age := directives.get('max-age')) and re.fullmatch(r'\d+', max_age):
+            return now + int(max_age)
+        if 'expires' in headers:
+            return _parse_http_date(headers['expires']) or now
+        # Heuristic freshness: 10% of the time since the page last changed, capped at the default TTL
+        if last_modified := _parse_http_date(headers.get('last-modified')):
+            return now + min(max(now - last_modified, 0) * 0.1, self.default_ttl)
+        return now + self.default_ttl
+
+    def get_stats(self) -> Dict[str, float]:
+        """Returns hit/miss counters and the current stored size."""
+        with self._lock:
+            return {
+                **self._store.get_stats(),
+                'hits': self.hits,
+                'misses': self.misses,
+                'revalidations': self.revalidations,
+            }
+
+    def close(self):
+        self._store.close()
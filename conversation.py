@@ -0,0 +1,129 @@
+# conversation.py
+
+import logging
+import re
+from typing import Callable, Dict, Iterable, List, Optional
+
+from config import (MAX_CHAT_HISTORY_LENGTH, MAX_TRUNCATE_LENGTH, CONTEXT_SUMMARY_MAX_TOKENS,
+                    CONTEXT_SUMMARY_LINE_CHARS)
+from utils import CHARS_PER_TOKEN, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_END_PATTERN = re.compile(r'(?<=[.!?])\s')
+CONTEXT_TEMPLATE = "\nLatest Progress: {progress}\nTarget final output and/or instruction from the user: {prompt}"
+SUMMARY_TEMPLATE = "\nEarlier Progress (summary):\n{summary}"
+
+
+def summarize_turn(summary: str, entry: str) -> str:
+    """Folds a dropped chat turn into the running summary.
+
+    Keeps the speaker and the opening of the turn, one line per turn, and
+    drops the oldest lines once the summary exceeds CONTEXT_SUMMARY_MAX_TOKENS.
+    """
+    text = " ".join(entry.split())
+    line = SENTENCE_END_PATTERN.split(text[:CONTEXT_SUMMARY_LINE_CHARS * 2], maxsplit=1)[0]
+    if len(line) > CONTEXT_SUMMARY_LINE_CHARS:
+        line = line[:CONTEXT_SUMMARY_LINE_CHARS].rsplit(" ", 1)[0] + "..."
+    lines = (summary.splitlines() if summary else []) + [f"- {line}"]
+    while len(lines) > 1 and estimate_tokens("\n".join(lines)) > CONTEXT_SUMMARY_MAX_TOKENS:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+class ChatHistory(list):
+    """Chat log that keeps its prompt cost bounded.
+
+    A drop-in replacement for the plain ``List[str]`` chat log. Entries are
+    truncated to MAX_TRUNCATE_LENGTH characters and their token counts are
+    estimated once, when they are added. Only the last ``max_entries`` turns are
+    kept verbatim; older turns are folded into ``summary`` by ``summarizer`` as
+    they drop out, so building a prompt never has to re-read the whole session.
+    """
+
+    def __init__(self, entries: Iterable[str] = (), max_entries: int = MAX_CHAT_HISTORY_LENGTH,
+                 summarizer: Callable[[str, str], str] = summarize_turn):
+        super().__init__()
+        self.max_entries = max_entries
+        self.summarizer = summarizer
+        self.summary = ""
+        self.summary_tokens = 0
+        self._tokens: Dict[str, int] = {}
+        self.extend(entries)
+
+    def append(self, entry: str) -> None:
+        if len(entry) > MAX_TRUNCATE_LENGTH:
+            entry = entry[:MAX_TRUNCATE_LENGTH] + "..."
+        if entry not in self._tokens:
+            self._tokens[entry] = estimate_tokens(entry)
+        super().append(entry)
+        while len(self) > self.max_entries:
+            self._compact(self.pop(0))
+
+    def extend(self, entries: Iterable[str]) -> None:
+        for entry in entries:
+            self.append(entry)
+
+    def copy(self) -> "ChatHistory":
+        """Returns an independent history with the same entries and summary."""
+        history = ChatHistory(max_entries=self.max_entries, summarizer=self.summarizer)
+        history.summary = self.summary
+        history.summary_tokens = self.summary_tokens
+        history._tokens = dict(self._tokens)
+        list.extend(history, self)
+        return history
+
+    def token_count(self, entry: str) -> int:
+        """Returns the estimated tokens of an entry, computed when it was added."""
+        tokens = self._tokens.get(entry)
+        return tokens if tokens is not None else estimate_tokens(entry)
+
+    def _compact(self, entry: str):
+        if entry not in self:
+            self._tokens.pop(entry, None)
+        try:
+            self.summary = self.summarizer(self.summary, entry)
+        except Exception as e:
+            logger.error(f"Error summarizing chat history: {e}")
+            return
+        self.summary_tokens = estimate_tokens(self.summary)
+
+
+def build_context(prompt: str, chat_log: List[str], max_tokens: Optional[int] = None) -> str:
+    """Assembles the conversation context for a model call within a token budget.
+
+    The newest turns are included first, as many as fit alongside the prompt;
+    the summary of older turns goes in ahead of them if there is still room.
+    If not even the newest turn fits, its most recent part is included.
+
+    Args:
+        prompt (str): The user's instruction, always included in full.
+        chat_log (List[str]): The conversation, a ChatHistory or a plain list.
+        max_tokens (int, optional): Estimated token budget; unlimited if None.
+
+    Returns:
+        str: The context prompt.
+    """
+    history = chat_log if isinstance(chat_log, ChatHistory) else None
+    recent = chat_log[-MAX_CHAT_HISTORY_LENGTH:]
+    summary = history.summary if history is not None else ""
+    token_count = history.token_count if history is not None else estimate_tokens
+
+    remaining = float('inf') if max_tokens is None else max_tokens - estimate_tokens(CONTEXT_TEMPLATE + prompt)
+    included: List[str] = []
+    for entry in reversed(recent):
+        tokens = token_count(entry) + 1
+        if tokens > remaining:
+            if not included and remaining > 0:
+                included.append("..." + entry[-int(remaining) * CHARS_PER_TOKEN:])
+            break
+        included.append(entry)
+        remaining -= tokens
+
+    if len(included) < len(recent):
+        logger.info(f"Context budget of {max_tokens} tokens fits {len(included)} of {len(recent)} recent turns")
+    context = CONTEXT_TEMPLATE.format(progress="\n".join(reversed(included)), prompt=prompt)
+    summary_fits = summary and history.summary_tokens + estimate_tokens(SUMMARY_TEMPLATE) <= remaining
+    if summary_fits and len(included) == len(recent):
+        context = SUMMARY_TEMPLATE.format(summary=summary) + context
+    return context
@@ -0,0 +1,97 @@
+# dedup.py
+
+import hashlib
+import logging
+import re
+from typing import Any, Dict, List, Set, Tuple
+
+from config import DEDUP_SHINGLE_SIZE, DEDUP_MAX_HAMMING_DISTANCE
+from http_client import normalize_url
+from utils import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def content_fingerprint(text: str) -> str:
+    """Hashes a text after normalizing case and whitespace, for exact duplicate detection."""
+    return hashlib.sha1(' '.join(WORD_PATTERN.findall(text.lower())).encode('utf-8')).hexdigest()
+
+
+def simhash(text: str, shingle_size: int = DEDUP_SHINGLE_SIZE) -> int:
+    """Computes a 64-bit SimHash of a text over overlapping word shingles.
+
+    Texts that share most of their shingles get hashes that differ in only a
+    few bits, so near-duplicates can be found by Hamming distance.
+    """
+    words = WORD_PATTERN.findall(text.lower())
+    shingles = {' '.join(words[i:i + shingle_size]) for i in range(max(len(words) - shingle_size + 1, 1))}
+    bit_strings = [format(int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big'),
+                          '064b') for shingle in shingles]
+    # A bit is set in the SimHash when it is set in more than half of the shingle hashes
+    majority = len(bit_strings) / 2
+    return int(''.join('1' if column.count('1') > majority else '0' for column in zip(*bit_strings)), 2)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class ResultDeduplicator:
+    """Drops duplicate search results before they are added to a research prompt.
+
+    A result is dropped when its canonical URL or normalized content has been
+    seen before (exact duplicate), or when the SimHash of its content is within
+    DEDUP_MAX_HAMMING_DISTANCE bits of an earlier result's (near-duplicate, e.g.
+    syndicated copies and mirrors). State is kept across calls, so one instance
+    deduplicates across all queries of a research request.
+    """
+
+    def __init__(self, max_distance: int = DEDUP_MAX_HAMMING_DISTANCE):
+        self.max_distance = max_distance
+        self._urls: Set[str] = set()
+        self._fingerprints: Set[str] = set()
+        self._simhashes: List[int] = []
+
+    def filter(self, results: List[Dict]) -> Tuple[List[Dict], Dict[str, Any]]:
+        """Removes results that duplicate earlier ones.
+
+        Args:
+            results (List[Dict]): Search results with 'url' and 'content' keys, in rank order.
+
+        Returns:
+            Tuple[List[Dict], Dict[str, Any]]: The kept results (order preserved) and
+                                               counts of what was dropped and saved.
+        """
+        kept = []
+        stats = {'results': len(results), 'exact_duplicates': 0, 'near_duplicates': 0,
+                 'chars_saved': 0, 'tokens_saved': 0}
+        for result in results:
+            content = result.get('content') or ''
+            url = normalize_url(result['url']) if result.get('url') else None
+            duplicate = None
+            if url in self._urls:
+                duplicate = 'exact_duplicates'
+            elif content:
+                fingerprint = content_fingerprint(content)
+                if fingerprint in self._fingerprints:
+                    duplicate = 'exact_duplicates'
+                else:
+                    signature = simhash(content)
+                    if any(hamming_distance(signature, seen) <= self.max_distance for seen in self._simhashes):
+                        duplicate = 'near_duplicates'
+                    else:
+                        self._fingerprints.add(fingerprint)
+                        self._simhashes.append(signature)
+
+            if duplicate:
+                stats[duplicate] += 1
+                stats['chars_saved'] += len(content)
+                stats['tokens_saved'] += estimate_tokens(content)
+                continue
+            if url:
+                self._urls.add(url)
+            kept.append(result)
+        stats['kept'] = len(kept)
+        return kept, stats
@@ -0,0 +1,173 @@
+# extraction.py
+
+import logging
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+from config import EXTRACTION_BACKEND
+
+logger = logging.getLogger(__name__)
+
+# Elements that never hold a page's main content
+BOILERPLATE_TAGS = ['nav', 'header', 'footer', 'aside', 'script', 'style', 'noscript', 'template']
+# Elements that start a new line of text; their text must not run into their neighbours'
+BLOCK_TAGS = ['p', 'div', 'section', 'article', 'main', 'li', 'ul', 'ol', 'br', 'tr', 'td', 'th', 'table',
+              'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'blockquote', 'pre', 'dd', 'dt', 'figcaption']
+CONTENT_CLASS_PATTERN = re.compile(r'content|main-content|post-content|body|main-body|body-content|main',
+                                   re.IGNORECASE)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+class ExtractionBackend(ABC):
+    """Abstract base class for HTML-to-text extraction backends."""
+
+    name = ""
+
+    @abstractmethod
+    def extract(self, html: str) -> str:
+        """Extracts the main content of an HTML document as whitespace-normalized text."""
+        pass
+
+
+class Html2TextBackend(ExtractionBackend):
+    """Original extraction path: BeautifulSoup (html.parser) followed by html2text."""
+
+    name = "html2text"
+
+    def extract(self, html: str) -> str:
+        import html2text
+        from bs4 import BeautifulSoup, Comment
+
+        soup = BeautifulSoup(html, 'html.parser')
+        for element in soup(['nav', 'header', 'footer', 'aside', 'script', 'style']):
+            element.decompose()
+
+        for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+            comment.extract()
+
+        content = soup.find('main') or soup.find('article') or soup.find('div', class_=CONTENT_CLASS_PATTERN)
+
+        if not content:
+            content = soup.body
+
+        if content:
+            h = html2text.HTML2Text()
+            h.ignore_links = True
+            h.ignore_images = True
+            text = h.handle(str(content))
+
+            text = re.sub(r'\n+', '\n', text)
+            text = WHITESPACE_PATTERN.sub(' ', text)
+            return text.strip()
+        return ""
+
+
+class LxmlBackend(ExtractionBackend):
+    """Single-pass extraction on an lxml tree, without re-serializing the document.
+
+    Main content is the first <main> or <article>; failing that, the div with a
+    content-like class holding the most text; failing that, <body>.
+    """
+
+    name = "lxml"
+
+    def __init__(self):
+        from lxml import html as lxml_html
+        self._parser = lxml_html.HTMLParser(encoding='utf-8', remove_comments=True, remove_pis=True)
+
+    def extract(self, html: str) -> str:
+        from lxml import etree, html as lxml_html
+
+        try:
+            root = lxml_html.document_fromstring(html.encode('utf-8', errors='replace'), parser=self._parser)
+        except (etree.ParserError, ValueError):
+            return ""
+        etree.strip_elements(root, *BOILERPLATE_TAGS, with_tail=False)
+
+        content = self._find_main_content(root)
+        if content is None:
+            return ""
+        for element in content.iter(*BLOCK_TAGS):
+            element.text = ' ' + (element.text or '')
+            element.tail = ' ' + (element.tail or '')
+        return WHITESPACE_PATTERN.sub(' ', ''.join(content.itertext())).strip()
+
+    @staticmethod
+    def _find_main_content(root):
+        for tag in ('main', 'article'):
+            found = root.find(f'.//{tag}')
+            if found is not None:
+                return found
+        candidates = [div for div in root.iter('div') if CONTENT_CLASS_PATTERN.search(div.get('class') or '')]
+        if candidates:
+            return max(candidates, key=lambda div: len(div.text_content()))
+        body = root.find('body')
+        return body if body is not None else root
+
+
+class SelectolaxBackend(ExtractionBackend):
+    """Extraction on selectolax's Lexbor parser; the fastest backend when installed."""
+
+    name = "selectolax"
+
+    def extract(self, html: str) -> str:
+        from selectolax.lexbor import LexborHTMLParser
+
+        tree = LexborHTMLParser(html)
+        tree.strip_tags(BOILERPLATE_TAGS)
+
+        content = tree.css_first('main') or tree.css_first('article')
+        if content is None:
+            candidates = [div for div in tree.css('div[class]')
+                          if CONTENT_CLASS_PATTERN.search(div.attributes.get('class') or '')]
+            if candidates:
+                content = max(candidates, key=lambda div: len(div.text(deep=True)))
+            else:
+                content = tree.body
+        if content is None:
+            return ""
+        return WHITESPACE_PATTERN.sub(' ', content.text(deep=True, separator=' ')).strip()
+
+
+BACKENDS = {
+    SelectolaxBackend.name: SelectolaxBackend,
+    LxmlBackend.name: LxmlBackend,
+    Html2TextBackend.name: Html2TextBackend,
+}
+
+_instances: Dict[str, ExtractionBackend] = {}
+
+
+def available_backends() -> List[str]:
+    """Returns the names of the backends whose parser libraries are installed."""
+    names = []
+    for name, module in (('selectolax', 'selectolax'), ('lxml', 'lxml'), ('html2text', 'html2text')):
+        try:
+            __import__(module)
+            names.append(name)
+        except ImportError:
+            pass
+    return names
+
+
+def get_extraction_backend(name: str = EXTRACTION_BACKEND) -> ExtractionBackend:
+    """Returns a shared instance of the named backend.
+
+    Falls back to the next available backend (selectolax, lxml, html2text) when
+    the requested one is not installed.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown extraction backend: {name}")
+    if name not in _instances:
+        available = available_backends()
+        if name not in available:
+            fallback = available[0] if available else Html2TextBackend.name
+            logger.warning(f"Extraction backend '{name}' is not installed. Using '{fallback}' instead.")
+            _instances[name] = get_extraction_backend(fallback)
+        else:
+            _instances[name] = BACKENDS[name]()
+    return _instances[name]
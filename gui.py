@@ -1,13 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, Menu, filedialog, simpledialog, messagebox
 import logging
+import threading
 from typing import List, Optional, Tuple, Dict
 from functools import partial
 
 from models import ModelManager, ModelFactory, generate_convo_context
+from conversation import ChatHistory
 from agents import AgentManager
 from search_manager import SearchManager, SearchAPI, DuckDuckGoSearchProvider
 from config import MAX_SEARCH_RESULTS
+from workflow import think_tank_workflow
 import json
 logger = logging.getLogger(__name__)
 
@@ -67,7 +70,7 @@ class App(tk.Tk):
         self.agent_manager = AgentManager()
         self.search_manager = search_manager 
 
-        self.chat_log: List[str] = []
+        self.chat_log: List[str] = ChatHistory()
         self.context = ""
         self.current_prompt = ""
         self.last_output = ""
@@ -102,6 +105,11 @@ class App(tk.Tk):
         self.model_dropdown['values'] = list(self.modifier_groups.keys())
         self.model_dropdown.pack()
 
+        self.think_tank_var = tk.BooleanVar(value=False)
+        self.think_tank_check = ttk.Checkbutton(self.sidebar_frame, text="Think tank workflow",
+                                                variable=self.think_tank_var)
+        self.think_tank_check.pack()
+
         self.modifier_tree = ModifierTreeView(self.sidebar_frame)
         self.modifier_tree.pack(fill="both", expand=True)
 
@@ -126,8 +134,73 @@ class App(tk.Tk):
         self.edit_menu.add_command(label="Paste", command=self.paste)
 
     def run_workflow(self, event):
-        # Implementation of the workflow
-        pass
+        prompt = self.user_prompt.get().strip()
+        if not prompt:
+            return
+        self.user_prompt.delete(0, tk.END)
+        self.current_prompt = prompt
+        if self.think_tank_var.get():
+            self.run_think_tank(prompt)
+            return
+        model_type = self.model_var.get() if self.model_var.get() in ModelManager.MODEL_CONFIGS else "writer"
+        self.stream_to_chat(model_type, prompt)
+
+    def run_think_tank(self, prompt: str):
+        """Runs the think-tank agents as a workflow on a worker thread, independent agents in parallel.
+
+        Each agent's output is shown as soon as its step finishes.
+        """
+        self.chat_history.insert(tk.END, f"\nYou: {prompt}\n")
+        self.user_prompt.state(["disabled"])
+
+        def show_step(name: str, output: str):
+            self.after(0, self.append_chat_text, f"\n{name.capitalize()}: {output}\n")
+
+        def worker():
+            final_output = ""
+            try:
+                result = think_tank_workflow(self.model_manager, self.search_manager).run(prompt, self.chat_log,
+                                                                                          show_step)
+                if result['critical_path']:
+                    final_output = result['outputs'][result['critical_path'][-1]]
+            except Exception as e:
+                logger.error(f"Error running the think tank workflow: {e}")
+                self.after(0, self.append_chat_text, f"\n[Error: {e}]")
+            finally:
+                self.after(0, self.finish_stream, final_output)
+
+        threading.Thread(target=worker, name="think-tank", daemon=True).start()
+
+    def stream_to_chat(self, model_type: str, prompt: str):
+        """Streams a model response into the chat history as it is generated, without blocking the UI."""
+        self.chat_history.insert(tk.END, f"\nYou: {prompt}\n\n{model_type.capitalize()}: ")
+        self.user_prompt.state(["disabled"])
+
+        def worker():
+            chunks = []
+            try:
+                for text in self.model_manager.stream_response(model_type, prompt, self.chat_log, self.context,
+                                                               self.search_manager):
+                    chunks.append(text)
+                    # Tk widgets may only be touched from the main thread
+                    self.after(0, self.append_chat_text, text)
+            except Exception as e:
+                logger.error(f"Error streaming {model_type} response: {e}")
+                self.after(0, self.append_chat_text, f"\n[Error: {e}]")
+            finally:
+                # Always re-enable the input, even if the stream failed partway through
+                self.after(0, self.finish_stream, "".join(chunks))
+
+        threading.Thread(target=worker, name="stream-response", daemon=True).start()
+
+    def append_chat_text(self, text: str):
+        self.chat_history.insert(tk.END, text)
+        self.chat_history.see(tk.END)
+
+    def finish_stream(self, response_text: str):
+        self.last_output = response_text
+        self.chat_history.insert(tk.END, "\n")
+        self.user_prompt.state(["!disabled"])
 
     def open_file(self):
         # Implementation of open file
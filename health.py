@@ -0,0 +1,176 @@
+# health.py
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+from config import (BREAKER_FAILURE_THRESHOLD, BREAKER_ERROR_RATE, BREAKER_WINDOW, BREAKER_MIN_SAMPLES,
+                    BREAKER_COOLDOWN, BREAKER_MAX_COOLDOWN)
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Tracks the health of one target (a search provider or a domain).
+
+    The breaker opens after BREAKER_FAILURE_THRESHOLD consecutive failures, or
+    when the error rate over the last BREAKER_WINDOW calls exceeds
+    BREAKER_ERROR_RATE. While open, calls are refused. After the cooldown a
+    single probe call is let through (half-open): success closes the breaker,
+    failure re-opens it with the cooldown doubled up to BREAKER_MAX_COOLDOWN.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.cooldown = BREAKER_COOLDOWN
+        self.opened_at = 0.0
+        self.probe_started_at: Optional[float] = None
+        self._outcomes: deque = deque(maxlen=BREAKER_WINDOW)  # (succeeded, latency)
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Checks if a call may go ahead. Claims the probe slot when half-opening."""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and now - self.opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+                self.probe_started_at = None
+            if self.state == HALF_OPEN:
+                # Let one probe through at a time; a probe that never reports back expires after the cooldown
+                if self.probe_started_at is None or now - self.probe_started_at >= self.cooldown:
+                    self.probe_started_at = now
+                    return True
+            return False
+
+    def is_open(self) -> bool:
+        """Checks if calls are being refused, without claiming a probe."""
+        with self._lock:
+            return self.state == OPEN and time.monotonic() - self.opened_at < self.cooldown
+
+    def record_success(self, latency: float = 0.0):
+        with self._lock:
+            self._outcomes.append((True, latency))
+            self.consecutive_failures = 0
+            if self.state != CLOSED:
+                logger.info(f"Circuit for {self.name} closed")
+            self.state = CLOSED
+            self.cooldown = BREAKER_COOLDOWN
+
+    def record_failure(self, latency: float = 0.0):
+        with self._lock:
+            self._outcomes.append((False, latency))
+            self.consecutive_failures += 1
+            # A call made after the cooldown without claiming the probe counts as a failed probe
+            if self.state == HALF_OPEN or (self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown):
+                self.cooldown = min(self.cooldown * 2, BREAKER_MAX_COOLDOWN)
+                self._open()
+            elif self.state == CLOSED and (self.consecutive_failures >= BREAKER_FAILURE_THRESHOLD
+                                           or self._error_rate() > BREAKER_ERROR_RATE):
+                self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        logger.warning(f"Circuit for {self.name} opened for {self.cooldown:.0f}s "
+                       f"({self.consecutive_failures} consecutive failures, error rate {self._error_rate():.0%})")
+
+    def _error_rate(self) -> float:
+        if len(self._outcomes) < BREAKER_MIN_SAMPLES:
+            return 0.0
+        return sum(1 for succeeded, _ in self._outcomes if not succeeded) / len(self._outcomes)
+
+    def health_score(self) -> float:
+        """Scores the target from 0 (failing) to 1 (healthy and fast).
+
+        The score is the recent success rate, discounted by average latency
+        (a target averaging 5 seconds scores half of an instant one).
+        """
+        with self._lock:
+            if self.state == OPEN:
+                return 0.0
+            if not self._outcomes:
+                return 1.0
+            success_rate = sum(1 for succeeded, _ in self._outcomes if succeeded) / len(self._outcomes)
+            average_latency = sum(latency for _, latency in self._outcomes) / len(self._outcomes)
+            return success_rate / (1 + average_latency / 5)
+
+    def snapshot(self) -> Dict[str, Any]:
+        score = self.health_score()
+        with self._lock:
+            return {
+                'state': self.state,
+                'calls': len(self._outcomes),
+                'error_rate': self._error_rate(),
+                'consecutive_failures': self.consecutive_failures,
+                'health_score': score,
+            }
+
+
+class HealthRegistry:
+    """Circuit breakers keyed by target, e.g. "provider:Google", "domain:example.com" or "model:<name>"."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def provider_key(name: str) -> str:
+        return f"provider:{name}"
+
+    @staticmethod
+    def domain_key(host: str) -> str:
+        return f"domain:{host.lower()}"
+
+    @staticmethod
+    def model_key(name: str) -> str:
+        return f"model:{name}"
+
+    def get(self, key: str) -> CircuitBreaker:
+        """Returns the breaker for a target, creating it on first use."""
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = self._breakers[key] = CircuitBreaker(key)
+            return breaker
+
+    def allow(self, key: str) -> bool:
+        return self.get(key).allow()
+
+    def is_open(self, key: str) -> bool:
+        """Checks if a target is currently being failed fast, without claiming a probe."""
+        return self.get(key).is_open()
+
+    def record_success(self, key: str, latency: float = 0.0):
+        self.get(key).record_success(latency)
+
+    def record_failure(self, key: str, latency: float = 0.0):
+        self.get(key).record_failure(latency)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the state and health score of every tracked target."""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+
+_shared_registry: Optional[HealthRegistry] = None
+_shared_registry_lock = threading.Lock()
+
+
+def get_health_registry() -> HealthRegistry:
+    """Returns the process-wide HealthRegistry."""
+    global _shared_registry
+    with _shared_registry_lock:
+        if _shared_registry is None:
+            _shared_registry = HealthRegistry()
+        return _shared_registry
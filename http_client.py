@@ -0,0 +1,346 @@
+# http_client.py
+
+import asyncio
+import logging
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.request import ACCEPT_ENCODING
+
+from config import HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP2_ENABLED
+
+logger = logging.getLogger(__name__)
+
+TRACKING_PARAMS = {'gclid', 'fbclid', 'msclkid', 'mc_cid', 'mc_eid', 'ref', 'ref_src'}
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url: str) -> str:
+    """Normalizes a URL so equivalent addresses map to the same cache key.
+
+    Lowercases the scheme and host, drops default ports, fragments and tracking
+    parameters (utm_*, gclid, ...), and sorts the remaining query parameters.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or '').lower()
+        port = parts.port
+    except (AttributeError, ValueError):
+        return url
+    netloc = host if port is None or DEFAULT_PORTS.get(scheme) == port else f"{host}:{port}"
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    ))
+    return urlunsplit((scheme, netloc, parts.path or '/', query, ''))
+
+
+class ConnectionMetrics:
+    """Thread-safe counters describing how well connections are being reused."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.errors = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_connection(self):
+        with self._lock:
+            self.connections += 1
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns the current counters, including derived reuse figures."""
+        with self._lock:
+            reused = max(self.requests - self.connections, 0)
+            return {
+                'requests': self.requests,
+                'connections_opened': self.connections,
+                'connections_reused': reused,
+                'reuse_ratio': reused / self.requests if self.requests else 0.0,
+                'errors': self.errors,
+            }
+
+
+def _counting_pool(base: type, metrics: ConnectionMetrics) -> type:
+    """Builds a urllib3 connection pool class that counts newly opened connections."""
+
+    class CountingPool(base):
+        def _new_conn(self):
+            metrics.record_connection()
+            return super()._new_conn()
+
+    return CountingPool
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools report new connections to a ConnectionMetrics."""
+
+    def __init__(self, metrics: ConnectionMetrics, **kwargs: Any):
+        self.metrics = metrics
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _counting_pool(HTTPConnectionPool, self.metrics),
+            'https': _counting_pool(HTTPSConnectionPool, self.metrics),
+        }
+
+
+class _HTTPXResponse:
+    """Wraps an httpx response so callers can treat it like a requests response."""
+
+    def __init__(self, response):
+        self._response = response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._response, name)
+
+    def raise_for_status(self):
+        if self._response.status_code >= 400:
+            raise requests.exceptions.HTTPError(
+                f"{self._response.status_code} Error for url: {self._response.url}", response=self)
+
+
+def _http2_available() -> bool:
+    """Checks whether httpx with HTTP/2 support (the h2 package) is installed."""
+    try:
+        import httpx  # noqa: F401
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HTTPClient:
+    """Pooled, keep-alive HTTP client shared by the search and extraction code.
+
+    Uses a requests Session with one connection pool per host by default. When
+    ``http2`` is enabled and httpx[http2] is installed, an httpx client is used
+    instead. Responses are transparently decompressed (gzip/deflate, plus brotli
+    or zstd when their packages are installed) and only those encodings are
+    advertised to servers.
+    """
+
+    def __init__(self, pool_connections: int = HTTP_POOL_CONNECTIONS, pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                 http2: bool = HTTP2_ENABLED):
+        self.metrics = ConnectionMetrics()
+        self.default_headers = {'Accept-Encoding': ACCEPT_ENCODING}
+        self.http2 = http2 and _http2_available()
+        if http2 and not self.http2:
+            logger.warning("HTTP/2 requested but httpx[http2] is not installed. Falling back to HTTP/1.1.")
+
+        if self.http2:
+            import httpx
+            self._client = httpx.Client(
+                http2=True,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=pool_connections * pool_maxsize,
+                                    max_keepalive_connections=pool_connections * pool_maxsize),
+            )
+        else:
+            self._client = requests.Session()
+            adapter = _CountingAdapter(self.metrics, pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+            self._client.mount('http://', adapter)
+            self._client.mount('https://', adapter)
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None,
+            timeout: Optional[float] = None):
+        """Sends a GET request over a pooled connection.
+
+        Args:
+            url (str): The URL to fetch.
+            params (Dict[str, Any], optional): Query string parameters.
+            headers (Dict[str, str], optional): Extra request headers.
+            timeout (float, optional): Timeout in seconds.
+
+        Returns:
+            The response. It exposes the requests response interface
+            (status_code, headers, text, content, json(), raise_for_status()).
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails.
+        """
+        request_headers = {**self.default_headers, **(headers or {})}
+        self.metrics.record_request()
+        try:
+            if self.http2:
+                return self._get_httpx(url, params, request_headers, timeout)
+            return self._client.get(url, params=params, headers=request_headers, timeout=timeout)
+        except requests.exceptions.RequestException:
+            self.metrics.record_error()
+            raise
+
+    def _get_httpx(self, url: str, params: Optional[Dict[str, Any]], headers: Dict[str, str],
+                   timeout: Optional[float]) -> _HTTPXResponse:
+        """Sends a GET request with httpx, translating its errors to requests exceptions."""
+        import httpx
+
+        def trace(event_name: str, info: Dict[str, Any]):
+            if event_name == 'connection.connect_tcp.complete':
+                self.metrics.record_connection()
+
+        try:
+            request = self._client.build_request('GET', url, params=params, headers=headers, timeout=timeout,
+                                                 extensions={'trace': trace})
+            response = self._client.send(request)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.HTTPError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        return _HTTPXResponse(response)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Returns request and connection reuse counters for this client."""
+        return {'http2': self.http2, **self.metrics.snapshot()}
+
+    def close(self):
+        """Closes all pooled connections."""
+        self._client.close()
+
+
+class AsyncHTTPClient:
+    """Pooled, keep-alive asyncio HTTP client shared by the async search and extraction code.
+
+    Wraps httpx.AsyncClient (HTTP/2 when enabled and h2 is installed). An httpx
+    client is bound to the event loop it first runs on, so one client, with its
+    own connection pool, is kept per loop. Requests wait for a free pooled
+    connection instead of timing out; callers bound total time with asyncio
+    timeouts. Errors are raised as httpx exceptions.
+    """
+
+    def __init__(self, pool_connections: int = HTTP_POOL_CONNECTIONS, pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                 http2: bool = HTTP2_ENABLED):
+        self.metrics = ConnectionMetrics()
+        self.default_headers = {'Accept-Encoding': ACCEPT_ENCODING}
+        self.max_connections = pool_connections * pool_maxsize
+        self.http2 = http2 and _http2_available()
+        if http2 and not self.http2:
+            logger.warning("HTTP/2 requested but httpx[http2] is not installed. Falling back to HTTP/1.1.")
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _client(self):
+        """Returns the httpx client for the running event loop, creating it on first use."""
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    http2=self.http2,
+                    follow_redirects=True,
+                    limits=httpx.Limits(max_connections=self.max_connections,
+                                        max_keepalive_connections=self.max_connections),
+                )
+                self._clients[loop] = client
+            return client
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]):
+        if event_name == 'connection.connect_tcp.complete':
+            self.metrics.record_connection()
+
+    def _build_request(self, url: str, params: Optional[Dict[str, Any]], headers: Optional[Dict[str, str]],
+                       timeout: Optional[float]):
+        import httpx
+
+        self.metrics.record_request()
+        return self._client().build_request(
+            'GET', url, params=params, headers={**self.default_headers, **(headers or {})},
+            timeout=httpx.Timeout(timeout, pool=None), extensions={'trace': self._trace})
+
+    async def get(self, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None,
+                  timeout: Optional[float] = None):
+        """Sends a GET request over a pooled connection and reads the whole body.
+
+        Args:
+            url (str): The URL to fetch.
+            params (Dict[str, Any], optional): Query string parameters.
+            headers (Dict[str, str], optional): Extra request headers.
+            timeout (float, optional): Connect, read and write timeout in seconds.
+
+        Returns:
+            httpx.Response: The response.
+
+        Raises:
+            httpx.HTTPError: If the request fails.
+        """
+        import httpx
+
+        try:
+            return await self._client().send(self._build_request(url, params, headers, timeout))
+        except httpx.HTTPError:
+            self.metrics.record_error()
+            raise
+
+    @asynccontextmanager
+    async def stream(self, url: str, params: Optional[Dict[str, Any]] = None,
+                     headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> AsyncIterator[Any]:
+        """Sends a GET request and yields the response as soon as its headers arrive.
+
+        Read the body with ``response.aiter_bytes()``; the response is closed
+        when the context exits. Arguments and errors are as for ``get``.
+        """
+        import httpx
+
+        try:
+            response = await self._client().send(self._build_request(url, params, headers, timeout), stream=True)
+        except httpx.HTTPError:
+            self.metrics.record_error()
+            raise
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Returns request and connection counters across all event loops."""
+        return {'http2': self.http2, **self.metrics.snapshot()}
+
+    async def aclose(self):
+        """Closes the pooled connections of the running event loop."""
+        with self._lock:
+            client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+_shared_client: Optional[HTTPClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_http_client() -> HTTPClient:
+    """Returns the process-wide shared HTTPClient, creating it on first use."""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = HTTPClient()
+        return _shared_client
+
+
+_shared_async_client: Optional[AsyncHTTPClient] = None
+
+
+def get_async_http_client() -> AsyncHTTPClient:
+    """Returns the process-wide shared AsyncHTTPClient, creating it on first use."""
+    global _shared_async_client
+    with _shared_client_lock:
+        if _shared_async_client is None:
+            _shared_async_client = AsyncHTTPClient()
+        return _shared_async_client
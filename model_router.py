@@ -0,0 +1,138 @@
+# model_router.py
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from config import (MODEL_ROUTER_MODELS, MODEL_ROUTER_QUALITY_FLOORS, MODEL_ROUTER_WINDOW, MODEL_ROUTER_MIN_SAMPLES,
+                    MODEL_ROUTER_SAMPLE_TTL, MODEL_ROUTER_RECENCY_DECAY, MODEL_ROUTER_SHORT_PROMPT_FLOORS,
+                    MODEL_ROUTER_SHORT_PROMPT_TOKENS)
+from health import HealthRegistry, get_health_registry
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRouter:
+    """Picks the model for each call from rolling latency and health statistics.
+
+    Every model has a quality rank and a context window. A call may use models
+    whose quality meets its role's floor (lower for some roles when the prompt
+    is short) and whose context window fits the
+    prompt; among those, models with an open circuit breaker are skipped and the
+    rest are ordered by predicted latency for the prompt's size. The prediction
+    is a line (base latency plus seconds per 1k prompt tokens) fitted to the
+    model's recent successful calls, newest weighted most, falling back to the
+    configured priors.
+    Samples expire after ``sample_ttl`` seconds, so a model that slowed down is
+    tried again once its slow calls age out.
+    """
+
+    def __init__(self, models: Dict[str, Dict[str, Any]] = MODEL_ROUTER_MODELS,
+                 quality_floors: Dict[str, int] = MODEL_ROUTER_QUALITY_FLOORS,
+                 health: Optional[HealthRegistry] = None, window: int = MODEL_ROUTER_WINDOW,
+                 min_samples: int = MODEL_ROUTER_MIN_SAMPLES, sample_ttl: float = MODEL_ROUTER_SAMPLE_TTL,
+                 short_prompt_floors: Dict[str, int] = MODEL_ROUTER_SHORT_PROMPT_FLOORS,
+                 short_prompt_tokens: int = MODEL_ROUTER_SHORT_PROMPT_TOKENS):
+        self.models = models
+        self.quality_floors = quality_floors
+        self.short_prompt_floors = short_prompt_floors
+        self.short_prompt_tokens = short_prompt_tokens
+        self.health = health or get_health_registry()
+        self.min_samples = min_samples
+        self.sample_ttl = sample_ttl
+        self._samples: Dict[str, deque] = {name: deque(maxlen=window) for name in models}  # (time, tokens, latency)
+        self._lock = threading.Lock()
+
+    def candidates(self, model_type: str, prompt_tokens: int) -> List[str]:
+        """Returns the models to try for a call, best first.
+
+        Healthy models below the role's quality floor come last, highest quality
+        first, as fallbacks for when every model meeting the floor fails.
+        """
+        floor = self.quality_floor(model_type, prompt_tokens)
+        fitting = [name for name, spec in self.models.items() if prompt_tokens <= spec["context_tokens"]]
+        healthy = [name for name in fitting if not self.health.is_open(HealthRegistry.model_key(name))]
+        ranked = sorted((name for name in healthy if self.models[name]["quality"] >= floor),
+                        key=lambda name: self.estimate_latency(name, prompt_tokens))
+        fallbacks = sorted((name for name in healthy if self.models[name]["quality"] < floor),
+                           key=lambda name: -self.models[name]["quality"])
+        if not ranked and fallbacks:
+            logger.warning(f"No healthy model meets the quality floor for {model_type}; falling back below it")
+        if not ranked and not fallbacks:
+            # Everything is failing: let the breakers' probes decide
+            return sorted(fitting, key=lambda name: -self.models[name]["quality"])
+        return ranked + fallbacks
+
+    def quality_floor(self, model_type: str, prompt_tokens: int) -> int:
+        """Returns the minimum model quality for a call of a role with a prompt of ``prompt_tokens``."""
+        if model_type in self.short_prompt_floors and prompt_tokens <= self.short_prompt_tokens:
+            return self.short_prompt_floors[model_type]
+        return self.quality_floors.get(model_type, self.quality_floors["default"])
+
+    def estimate_latency(self, model_name: str, prompt_tokens: int) -> float:
+        """Predicts the seconds a call with a prompt of ``prompt_tokens`` takes on a model."""
+        spec = self.models[model_name]
+        base, per_token = spec["base_latency"], spec["seconds_per_1k_tokens"] / 1000
+        samples = self._recent_samples(model_name)
+        if len(samples) >= self.min_samples:
+            # Weighted least squares, so a model that slows down is noticed within a few calls
+            weights = [MODEL_ROUTER_RECENCY_DECAY ** age for age in range(len(samples) - 1, -1, -1)]
+            total = sum(weights)
+            mean_tokens = sum(w * tokens for w, (tokens, _) in zip(weights, samples)) / total
+            mean_latency = sum(w * latency for w, (_, latency) in zip(weights, samples)) / total
+            variance = sum(w * (tokens - mean_tokens) ** 2 for w, (tokens, _) in zip(weights, samples))
+            if variance > 0:
+                covariance = sum(w * (tokens - mean_tokens) * (latency - mean_latency)
+                                 for w, (tokens, latency) in zip(weights, samples))
+                per_token = max(covariance / variance, 0.0)
+            base = max(mean_latency - per_token * mean_tokens, 0.0)
+        return base + per_token * prompt_tokens
+
+    def _recent_samples(self, model_name: str) -> List[tuple]:
+        cutoff = time.monotonic() - self.sample_ttl
+        with self._lock:
+            return [(tokens, latency) for at, tokens, latency in self._samples.get(model_name, ()) if at >= cutoff]
+
+    def allow(self, model_name: str) -> bool:
+        """Checks if a model may be called now, claiming its breaker's probe slot after a cooldown."""
+        return self.health.allow(HealthRegistry.model_key(model_name))
+
+    def is_open(self, model_name: str) -> bool:
+        """Checks if a model's breaker is refusing calls, without claiming a probe."""
+        return self.health.is_open(HealthRegistry.model_key(model_name))
+
+    def record(self, model_name: str, prompt_tokens: int, latency: float, succeeded: bool):
+        """Records the outcome of a call in the model's statistics and circuit breaker."""
+        key = HealthRegistry.model_key(model_name)
+        if succeeded:
+            self.health.record_success(key, latency)
+            with self._lock:
+                if model_name in self._samples:
+                    self._samples[model_name].append((time.monotonic(), prompt_tokens, latency))
+        else:
+            self.health.record_failure(key, latency)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns each model's sample count, predicted latency for a 1k-token prompt and breaker state."""
+        stats = {}
+        for name in self.models:
+            breaker = self.health.get(HealthRegistry.model_key(name)).snapshot()
+            stats[name] = {'samples': len(self._recent_samples(name)),
+                           'latency_1k': self.estimate_latency(name, 1000), 'state': breaker['state'],
+                           'error_rate': breaker['error_rate']}
+        return stats
+
+
+_shared_router: Optional[ModelRouter] = None
+_shared_router_lock = threading.Lock()
+
+
+def get_model_router() -> ModelRouter:
+    """Returns the process-wide ModelRouter, so statistics are shared by all model managers."""
+    global _shared_router
+    with _shared_router_lock:
+        if _shared_router is None:
+            _shared_router = ModelRouter()
+        return _shared_router
@@ -1,12 +1,38 @@
 # models.py
 
+import contextvars
+import hashlib
+import json
 import logging
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-from typing import Dict, Any, List, Optional
-import google.generativeai as genai
+from typing import TYPE_CHECKING, Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
+import requests
 
-from config import GEMINI_API_KEY, SAFETY_SETTINGS, MAX_SEARCH_RESULTS
+from config import (GEMINI_API_KEY, SAFETY_SETTINGS, MAX_SEARCH_RESULTS, MAX_SEARCH_QUERIES_PER_REQUEST,
+                    RESEARCH_CONTEXT_CHARS, RESPONSE_CACHE_ENABLED, RESPONSE_CACHE_MAX_TEMPERATURE,
+                    RESPONSE_CACHE_PINNED_MODELS, CONTEXT_TOKEN_BUDGETS, LLM_PROVIDER, LOCAL_LLM_API_KEY,
+                    LOCAL_LLM_BASE_URL, LOCAL_LLM_MODEL, LOCAL_LLM_TIMEOUT, FAKE_LLM_LATENCY,
+                    FAKE_LLM_TOKENS_PER_SECOND, FAKE_LLM_OUTPUT_TOKENS, MODEL_ROUTING_ENABLED,
+                    REQUEST_DEADLINE, MODEL_CALL_TIMEOUT, FAKE_LLM_SECONDS_PER_1K_PROMPT_TOKENS, RESEARCH_MAP_REDUCE,
+                    RESEARCH_DIGEST_PAGE_CHARS, RESEARCH_DIGEST_MAX_WORKERS)
+from conversation import build_context
 from search_manager import SearchManager
+from dedup import ResultDeduplicator
+from model_router import get_model_router
+from passages import select_across_results, select_passages
+from response_cache import ResponseCache, get_response_cache
+from retry import (DeadlineExceeded, RetryPolicy, check_deadline, deadline_after, deadline_scope,
+                   deadline_timeout)
+from utils import estimate_tokens
+
+# google.generativeai takes most of a second to import, so it is loaded when the first Gemini model is created
+if TYPE_CHECKING:
+    import google.generativeai as genai
 
 logger = logging.getLogger(__name__)
 
@@ -20,10 +46,13 @@ class ModelFactory:
     def initialize_model(
         system_instruction: str,
         model_name: str = "models/gemini-1.5-flash-latest",
+        api_key: Optional[str] = None,
         **generation_config: Any
-    ) -> genai.GenerativeModel:
+    ) -> 'genai.GenerativeModel':
         try:
-            genai.configure(api_key=GEMINI_API_KEY)
+            import google.generativeai as genai
+
+            genai.configure(api_key=api_key or GEMINI_API_KEY)
             return genai.GenerativeModel(
                 system_instruction=system_instruction,
                 model_name=model_name,
@@ -34,9 +63,199 @@ class ModelFactory:
             log_and_raise_error(f"Error initializing model: {e}", e)
 
     @classmethod
-    def create_model(cls, instruction: str, **config: Any) -> genai.GenerativeModel:
+    def create_model(cls, instruction: str, **config: Any) -> 'genai.GenerativeModel':
         return cls.initialize_model(instruction, **config)
 
+class LLMProvider(ABC):
+    """Abstract base class for LLM backends.
+
+    ``create_model`` turns a model spec (model name, system instruction and
+    generation config) into a handle that ``generate`` and ``stream`` run
+    prompts against. Generation config keys use the Gemini names (temperature,
+    top_p, top_k, max_output_tokens); providers map them to their own API.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def create_model(self, model_name: str, instruction: str, config: Dict[str, Any]) -> Any:
+        """Returns a handle for the given model spec."""
+        pass
+
+    @abstractmethod
+    def generate(self, model: Any, prompt: str, timeout: Optional[float] = None) -> str:
+        """Runs a prompt and returns the full response text, giving up after ``timeout`` seconds."""
+        pass
+
+    def stream(self, model: Any, prompt: str, timeout: Optional[float] = None) -> Iterator[str]:
+        """Runs a prompt and yields the response text in chunks.
+
+        Providers without streaming support yield the whole response as one chunk.
+        """
+        yield self.generate(model, prompt, timeout)
+
+    @staticmethod
+    def create_provider(name: str, api_key: Optional[str] = None, **kwargs: Any) -> 'LLMProvider':
+        """Creates a provider by name ("gemini", "openai"/"local" or "fake")."""
+        providers = {
+            "gemini": GeminiProvider,
+            "openai": OpenAICompatibleProvider,
+            "local": OpenAICompatibleProvider,
+            "fake": FakeProvider,
+        }
+        if name not in providers:
+            raise ValueError(f"Unknown LLM provider: {name}")
+        return providers[name](api_key=api_key, **kwargs)
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini through google.generativeai."""
+
+    name = "gemini"
+
+    def __init__(self, api_key: Optional[str] = None):
+        self.api_key = api_key or GEMINI_API_KEY
+
+    def create_model(self, model_name: str, instruction: str, config: Dict[str, Any]) -> 'genai.GenerativeModel':
+        return ModelFactory.create_model(instruction, model_name=model_name, api_key=self.api_key, **config)
+
+    @staticmethod
+    def _request_options(timeout: Optional[float]) -> Dict[str, Any]:
+        return {"request_options": {"timeout": timeout}} if timeout else {}
+
+    def generate(self, model: 'genai.GenerativeModel', prompt: str, timeout: Optional[float] = None) -> str:
+        response = model.generate_content(prompt, **self._request_options(timeout))
+        return response.text if response.text else ""
+
+    def stream(self, model: 'genai.GenerativeModel', prompt: str, timeout: Optional[float] = None) -> Iterator[str]:
+        for chunk in model.generate_content(prompt, stream=True, **self._request_options(timeout)):
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. a final safety or finish-reason chunk)
+                continue
+            if text:
+                yield text
+
+class OpenAICompatibleProvider(LLMProvider):
+    """Any server implementing the OpenAI chat completions API.
+
+    Covers OpenAI itself and local servers such as Ollama and llama.cpp's
+    llama-server. Model names in ``model_names`` map this app's model names
+    (e.g. "models/gemini-1.5-pro-latest") to the server's; unmapped names use
+    ``default_model``.
+    """
+
+    name = "openai"
+
+    def __init__(self, api_key: Optional[str] = None, base_url: str = LOCAL_LLM_BASE_URL,
+                 default_model: str = LOCAL_LLM_MODEL, model_names: Optional[Dict[str, str]] = None,
+                 timeout: float = LOCAL_LLM_TIMEOUT):
+        self.api_key = api_key or LOCAL_LLM_API_KEY
+        self.base_url = base_url.rstrip("/")
+        self.default_model = default_model
+        self.model_names = model_names or {}
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def create_model(self, model_name: str, instruction: str, config: Dict[str, Any]) -> Dict[str, Any]:
+        payload = {
+            "model": self.model_names.get(model_name, self.default_model),
+            "messages": [{"role": "system", "content": instruction}],
+        }
+        for key, api_key in (("temperature", "temperature"), ("top_p", "top_p"), ("max_output_tokens", "max_tokens")):
+            if key in config:
+                payload[api_key] = config[key]
+        return payload
+
+    def _post(self, model: Dict[str, Any], prompt: str, stream: bool, timeout: Optional[float]) -> requests.Response:
+        body = {**model, "messages": model["messages"] + [{"role": "user", "content": prompt}], "stream": stream}
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        response = self.session.post(f"{self.base_url}/chat/completions", json=body, headers=headers,
+                                     timeout=min(self.timeout, timeout) if timeout else self.timeout, stream=stream)
+        response.raise_for_status()
+        return response
+
+    def generate(self, model: Dict[str, Any], prompt: str, timeout: Optional[float] = None) -> str:
+        data = self._post(model, prompt, stream=False, timeout=timeout).json()
+        return data["choices"][0]["message"].get("content") or ""
+
+    def stream(self, model: Dict[str, Any], prompt: str, timeout: Optional[float] = None) -> Iterator[str]:
+        with self._post(model, prompt, stream=True, timeout=timeout) as response:
+            # Server-sent events: "data: {json}" lines, ending with "data: [DONE]"
+            for line in response.iter_lines():
+                line = line.decode("utf-8")
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or [{}]
+                if text := choices[0].get("delta", {}).get("content"):
+                    yield text
+
+class FakeProvider(LLMProvider):
+    """Deterministic offline stand-in for load tests and benchmarks.
+
+    Answers are pseudo-random words seeded by the model spec and prompt, so the
+    same call always returns the same text. Each call waits ``latency`` seconds
+    before its first token, plus ``seconds_per_1k_prompt_tokens`` for reading
+    the prompt, and then produces ``tokens_per_second`` tokens (one word per
+    token), streaming ``chunk_tokens`` at a time. A call that would
+    outlast its timeout raises TimeoutError once the timeout has passed.
+    """
+
+    name = "fake"
+    VOCABULARY = ("the", "analysis", "shows", "a", "clear", "trend", "in", "data", "and", "further", "research",
+                  "suggests", "that", "results", "vary", "by", "context", "with", "strong", "evidence", "for",
+                  "improvement", "across", "several", "sources", "of", "information")
+
+    def __init__(self, api_key: Optional[str] = None, latency: float = FAKE_LLM_LATENCY,
+                 tokens_per_second: float = FAKE_LLM_TOKENS_PER_SECOND, output_tokens: int = FAKE_LLM_OUTPUT_TOKENS,
+                 chunk_tokens: int = 8, seconds_per_1k_prompt_tokens: float = FAKE_LLM_SECONDS_PER_1K_PROMPT_TOKENS):
+        self.latency = latency
+        self.seconds_per_1k_prompt_tokens = seconds_per_1k_prompt_tokens
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.chunk_tokens = chunk_tokens
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def create_model(self, model_name: str, instruction: str, config: Dict[str, Any]) -> Dict[str, Any]:
+        return {"model_name": model_name, "instruction": instruction, "config": config}
+
+    def _answer(self, model: Dict[str, Any], prompt: str) -> List[str]:
+        with self._lock:
+            self.calls += 1
+        seed = hashlib.sha256(f"{model['model_name']}\0{model['instruction']}\0{prompt}".encode("utf-8")).digest()
+        rng = random.Random(seed)
+        count = min(self.output_tokens, model["config"].get("max_output_tokens", self.output_tokens))
+        return [rng.choice(self.VOCABULARY) for _ in range(count)]
+
+    def _first_token_latency(self, prompt: str) -> float:
+        return self.latency + estimate_tokens(prompt) * self.seconds_per_1k_prompt_tokens / 1000
+
+    @staticmethod
+    def _wait(seconds: float, deadline: Optional[float]):
+        if deadline is not None and time.monotonic() + seconds > deadline:
+            time.sleep(max(deadline - time.monotonic(), 0))
+            raise TimeoutError("Fake model call timed out")
+        time.sleep(seconds)
+
+    def generate(self, model: Dict[str, Any], prompt: str, timeout: Optional[float] = None) -> str:
+        words = self._answer(model, prompt)
+        self._wait(self._first_token_latency(prompt) + len(words) / self.tokens_per_second,
+                   time.monotonic() + timeout if timeout is not None else None)
+        return " ".join(words)
+
+    def stream(self, model: Dict[str, Any], prompt: str, timeout: Optional[float] = None) -> Iterator[str]:
+        words = self._answer(model, prompt)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        self._wait(self._first_token_latency(prompt), deadline)
+        for i in range(0, len(words), self.chunk_tokens):
+            chunk = words[i:i + self.chunk_tokens]
+            self._wait(len(chunk) / self.tokens_per_second, deadline)
+            yield " ".join(chunk) + (" " if i + self.chunk_tokens < len(words) else "")
+
 class ModelManager:
     MODEL_CONFIGS: Dict[str, tuple] = {
         "brainstorm": (
@@ -90,17 +309,39 @@ class ModelManager:
             "The assistant is referred to as the 'researcher'. The researcher's primary goal is to extract relevant information from search results and present it in a report for the requesting team member to provide missing/requested information based upon the context of the conversation / message log. !!! IT DOES NOT ASSUME OR MAKE UP FACTS. IT DOES NOT PROVIDE ANY INFORMATION TO THE TEAM THAT IS NOT PRESENT IN THE SEARCH RESULT CONTENT !!!",
             {"temperature": 0.3, "top_p": 0.7, "top_k": 30, "max_output_tokens": 32000},
         ),
+        "digest": (
+            "The assistant is referred to as the 'digester'. It reads one web page found for a search query and extracts, as concise bullet points, every fact, figure, date, name, definition and statement on the page that is relevant to the query. !!! IT DOES NOT ASSUME OR MAKE UP FACTS. IT ONLY REPORTS WHAT THE PAGE SAYS !!! If the page contains nothing relevant to the query, it replies with exactly: NO RELEVANT INFORMATION",
+            {"temperature": 0.2, "top_p": 0.7, "top_k": 30, "max_output_tokens": 2048},
+        ),
     }
 
+    NO_RELEVANT_INFORMATION = "NO RELEVANT INFORMATION"
+    # Shared by every ModelManager so concurrent research requests stay within the provider's limits together
+    _digest_slots = threading.BoundedSemaphore(RESEARCH_DIGEST_MAX_WORKERS)
+
     MODEL_NAMES = {
         "writer": "models/gemini-1.5-pro-latest",
         "default": "models/gemini-1.5-flash-latest"
     }
 
-    def __init__(self, search_enabled: bool = True):
+    def __init__(self, search_enabled: bool = True, cache_responses: bool = RESPONSE_CACHE_ENABLED,
+                 pinned_models: Iterable[str] = RESPONSE_CACHE_PINNED_MODELS,
+                 provider: Optional[LLMProvider] = None, routing: bool = MODEL_ROUTING_ENABLED,
+                 map_reduce_research: bool = RESEARCH_MAP_REDUCE):
         self.search_enabled = search_enabled
+        self.provider = provider or LLMProvider.create_provider(LLM_PROVIDER)
+        self.router = get_model_router() if routing else None
+        self.retry_policy = RetryPolicy()
+        self.map_reduce_research = map_reduce_research
+        self.cache_responses = cache_responses
+        self.pinned_models = set(pinned_models)
+        self.last_stream_metrics: Dict[str, float] = {}
 
-    def get_model(self, model_type: str) -> genai.GenerativeModel:
+    def get_model_spec(self, model_type: str, model_name: Optional[str] = None) -> Tuple[str, str, Dict[str, Any]]:
+        """Returns the model name, system instruction and generation config for a model type.
+
+        ``model_name`` overrides the model type's default model from MODEL_NAMES.
+        """
         if model_type not in self.MODEL_CONFIGS:
             raise ValueError(f"Unknown model type: {model_type}")
         instruction, config = self.MODEL_CONFIGS[model_type]
@@ -108,8 +349,129 @@ class ModelManager:
         if model_type in {"writer", "researcher"} and self.search_enabled:
             instruction += self.get_search_instructions()
 
-        model_name = self.MODEL_NAMES.get(model_type, self.MODEL_NAMES["default"])
-        return ModelFactory.create_model(instruction, model_name=model_name, **config)
+        model_name = model_name or self.MODEL_NAMES.get(model_type, self.MODEL_NAMES["default"])
+        return model_name, instruction, config
+
+    def set_provider(self, provider: Union[str, LLMProvider], api_key: Optional[str] = None, **kwargs: Any):
+        """Switches the LLM backend, given a provider or a provider name for LLMProvider.create_provider."""
+        if isinstance(provider, str):
+            provider = LLMProvider.create_provider(provider, api_key, **kwargs)
+        self.provider = provider
+        logger.info(f"Using the {provider.name} LLM provider")
+
+    def get_model(self, model_type: str, model_name: Optional[str] = None) -> Any:
+        return self.provider.create_model(*self.get_model_spec(model_type, model_name))
+
+    def route(self, model_type: str, prompt_tokens: int) -> List[str]:
+        """Returns the model names to try for a call, in order; just the default model when routing is off."""
+        if self.router is None:
+            return [self.get_model_spec(model_type)[0]]
+        return self.router.candidates(model_type, prompt_tokens)
+
+    def _record_call(self, model_name: str, prompt_tokens: int, latency: float, succeeded: bool):
+        if self.router is not None:
+            self.router.record(model_name, prompt_tokens, latency, succeeded)
+
+    def _allow_model(self, model_name: str) -> bool:
+        """Checks the model's circuit breaker before a call, claiming the probe after a cooldown."""
+        return self.router is None or self.router.allow(model_name)
+
+    @staticmethod
+    def get_context_budget(model_type: str) -> int:
+        """Returns the estimated token budget for the conversation context sent to a model type."""
+        return CONTEXT_TOKEN_BUDGETS.get(model_type, CONTEXT_TOKEN_BUDGETS["default"])
+
+    def is_cacheable(self, model_type: str) -> bool:
+        """Checks if a model type's responses go through the response cache.
+
+        Caching must be enabled, and the model type must be pinned or run at or
+        below RESPONSE_CACHE_MAX_TEMPERATURE, where repeated prompts give
+        near-identical answers.
+        """
+        if not self.cache_responses or model_type not in self.MODEL_CONFIGS:
+            return False
+        if model_type in self.pinned_models:
+            return True
+        return self.MODEL_CONFIGS[model_type][1].get("temperature", 1.0) <= RESPONSE_CACHE_MAX_TEMPERATURE
+
+    def _response_cache_key(self, model_type: str, model_name: str, prompt: str) -> str:
+        """Keys a response by provider, the model that answers, instruction, generation config and prompt."""
+        model_name, instruction, config = self.get_model_spec(model_type, model_name)
+        return ResponseCache.make_key(f"{self.provider.name}:{model_name}", instruction, config, prompt)
+
+    def _cached_response(self, model_type: str, prompt: str, candidates: List[str]) -> Optional[str]:
+        """Returns a cached answer to the prompt from any of the candidate models, or None."""
+        if not self.is_cacheable(model_type):
+            return None
+        for model_name in candidates:
+            key = self._response_cache_key(model_type, model_name, prompt)
+            if (cached := get_response_cache().get(key)) is not None:
+                logger.info(f"Serving cached {model_type} response from {model_name}")
+                return cached
+        return None
+
+    def _cache_response(self, model_type: str, model_name: str, prompt: str, response_text: str):
+        """Stores an answer under the model that produced it, if the model type is cached."""
+        if response_text and self.is_cacheable(model_type):
+            get_response_cache().put(self._response_cache_key(model_type, model_name, prompt), model_name,
+                                     response_text)
+
+    def _generate_text(self, model_type: str, prompt: str) -> str:
+        """Calls the routed model, failing over to the next candidate on errors.
+
+        Transient errors are retried on the same model under ``retry_policy``
+        first, unless the failures have opened the model's circuit breaker.
+        Models whose breaker refuses calls are skipped. Each attempt is limited
+        to MODEL_CALL_TIMEOUT seconds or the time left before the request deadline.
+
+        Answers are served from and stored in the response cache for cacheable
+        model types, keyed by the model that answered.
+        """
+        candidates = self.route(model_type, estimate_tokens(prompt))
+        if (cached := self._cached_response(model_type, prompt, candidates)) is not None:
+            return cached
+        response_text, model_name = self._call_models(model_type, prompt, candidates)
+        self._cache_response(model_type, model_name, prompt, response_text)
+        return response_text
+
+    def _call_models(self, model_type: str, prompt: str, candidates: Optional[List[str]] = None) -> Tuple[str, str]:
+        """Runs the failover loop of ``_generate_text`` without the response cache.
+
+        Returns:
+            Tuple[str, str]: The response text and the name of the model that produced it.
+        """
+        prompt_tokens = estimate_tokens(prompt)
+        last_error: Optional[Exception] = None
+        for model_name in candidates or self.route(model_type, prompt_tokens):
+            if not self._allow_model(model_name):
+                continue
+            model = self.get_model(model_type, model_name)
+            attempts = 0
+
+            def attempt() -> str:
+                nonlocal attempts
+                attempts += 1
+                if attempts > 1 and self.router is not None and self.router.is_open(model_name):
+                    raise RuntimeError(f"Circuit for {model_name} opened; not retrying it")
+                start = time.perf_counter()
+                try:
+                    text = self.provider.generate(model, prompt, timeout=deadline_timeout(MODEL_CALL_TIMEOUT))
+                except Exception:
+                    self._record_call(model_name, prompt_tokens, time.perf_counter() - start, False)
+                    raise
+                self._record_call(model_name, prompt_tokens, time.perf_counter() - start, True)
+                return text
+
+            try:
+                response_text = self.retry_policy.call(attempt, f"{model_name} call for {model_type}")
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                logger.warning(f"{model_name} failed for {model_type}: {e}")
+                last_error = e
+                continue
+            return response_text, model_name
+        raise last_error or RuntimeError(f"No model available for {model_type}")
 
     @staticmethod
     def get_search_instructions() -> str:
@@ -131,19 +493,14 @@ class ModelManager:
         search_manager: SearchManager
     ) -> str:
         try:
-            model = self.get_model(model_type)
-            context = generate_convo_context(user_prompt, chat_log)
-            response = model.generate_content(context)
-            response_text = response.text if response.text else ""
+            # Searches, page fetches and model calls below all share the request deadline
+            with deadline_scope(REQUEST_DEADLINE):
+                context = generate_convo_context(user_prompt, chat_log, self.get_context_budget(model_type))
+                response_text = self._generate_text(model_type, context)
 
-            if self.search_enabled and "SEARCH_QUERIES:" in response_text:
-                main_response, search_queries = self.parse_web_search_request(response_text)
-                chat_log.append(f"{model_type.capitalize()}: {response_text}")
-                search_output = self.perform_search(chat_log, context, search_queries, search_manager)
-
-                updated_prompt = f"{user_prompt}\n\nAdditional Information from Search Results:\n{search_output}"
-                updated_response = model.generate_content(updated_prompt)
-                response_text = updated_response.text if updated_response.text else ""
+                if updated_prompt := self._search_follow_up(model_type, user_prompt, response_text, chat_log,
+                                                            context, search_manager):
+                    response_text = self._generate_text(model_type, updated_prompt)
 
             chat_log.append(f"{model_type.capitalize()}: {response_text}")
             return response_text
@@ -151,13 +508,127 @@ class ModelManager:
             logger.error(f"Error generating response for {model_type}: {e}")
             return f"An error occurred while generating the response: {str(e)}"
 
+    def stream_response(
+        self,
+        model_type: str,
+        user_prompt: str,
+        chat_log: List[str],
+        context: str,
+        search_manager: SearchManager,
+        on_chunk: Optional[Callable[[str], None]] = None
+    ) -> Iterator[str]:
+        """Streaming variant of ``generate_response`` that yields text chunks as they arrive.
+
+        Chunks are also passed to ``on_chunk`` if given, so callers can either
+        iterate or register a callback. If the model requests a web search, its
+        first answer is streamed, the search runs, and the follow-up answer is
+        streamed after it. The final text is appended to ``chat_log`` once the
+        stream completes. Time to first chunk and total time are logged and kept
+        in ``last_stream_metrics``. The whole response, searches included, is
+        bounded by REQUEST_DEADLINE.
+
+        Yields:
+            str: The response text, chunk by chunk. On failure, the error message.
+        """
+        try:
+            # The deadline is passed explicitly: a context variable set here would leak to the consumer between yields
+            expires_at = deadline_after(REQUEST_DEADLINE)
+            context = generate_convo_context(user_prompt, chat_log, self.get_context_budget(model_type))
+            response_text = yield from self._stream_content(model_type, context, on_chunk, expires_at)
+
+            with deadline_scope(expires_at=expires_at):
+                updated_prompt = self._search_follow_up(model_type, user_prompt, response_text, chat_log, context,
+                                                        search_manager)
+            if updated_prompt:
+                response_text = yield from self._stream_content(model_type, updated_prompt, on_chunk, expires_at)
+
+            chat_log.append(f"{model_type.capitalize()}: {response_text}")
+        except Exception as e:
+            logger.error(f"Error streaming response for {model_type}: {e}")
+            message = f"An error occurred while generating the response: {str(e)}"
+            if on_chunk:
+                on_chunk(message)
+            yield message
+
+    def _stream_content(self, model_type: str, prompt: str, on_chunk: Optional[Callable[[str], None]],
+                        expires_at: Optional[float] = None) -> Iterator[str]:
+        """Streams one model call, yielding its chunks and returning the full text.
+
+        A response cache hit is yielded as a single chunk. A model that fails
+        before its first chunk is failed over like in ``_generate_text``. Each
+        call is limited to MODEL_CALL_TIMEOUT seconds or the time left before
+        ``expires_at`` (a time.monotonic() deadline).
+        """
+        prompt_tokens = estimate_tokens(prompt)
+        candidates = self.route(model_type, prompt_tokens)
+        if (cached := self._cached_response(model_type, prompt, candidates)) is not None:
+            self.last_stream_metrics = {'ttft': 0.0, 'total': 0.0, 'chunks': 1, 'chars': len(cached)}
+            if on_chunk:
+                on_chunk(cached)
+            yield cached
+            return cached
+
+        last_error: Optional[Exception] = None
+        for model_name in candidates:
+            if not self._allow_model(model_name):
+                continue
+            start = time.perf_counter()
+            first_chunk_at = None
+            chunks = []
+            check_deadline(f"{model_name} call for {model_type}", expires_at)
+            try:
+                for text in self.provider.stream(self.get_model(model_type, model_name), prompt,
+                                                 timeout=deadline_timeout(MODEL_CALL_TIMEOUT, expires_at)):
+                    if not text:
+                        continue
+                    if first_chunk_at is None:
+                        first_chunk_at = time.perf_counter()
+                    chunks.append(text)
+                    if on_chunk:
+                        on_chunk(text)
+                    yield text
+            except Exception as e:
+                self._record_call(model_name, prompt_tokens, time.perf_counter() - start, False)
+                # Once text has been shown the answer cannot be swapped for another model's
+                if chunks or isinstance(e, DeadlineExceeded):
+                    raise
+                logger.warning(f"{model_name} failed for {model_type}: {e}")
+                last_error = e
+                continue
+            self._record_call(model_name, prompt_tokens, time.perf_counter() - start, True)
+            break
+        else:
+            raise last_error or RuntimeError(f"No model available for {model_type}")
+
+        total = time.perf_counter() - start
+        ttft = (first_chunk_at - start) if first_chunk_at is not None else total
+        response_text = "".join(chunks)
+        self._cache_response(model_type, model_name, prompt, response_text)
+        self.last_stream_metrics = {'ttft': ttft, 'total': total, 'chunks': len(chunks), 'chars': len(response_text)}
+        logger.info(f"{model_type} streamed {len(response_text)} characters in {len(chunks)} chunks: "
+                    f"first chunk after {ttft:.2f}s, done after {total:.2f}s")
+        return response_text
+
+    def _search_follow_up(self, model_type: str, user_prompt: str, response_text: str, chat_log: List[str],
+                          context: str, search_manager: SearchManager) -> Optional[str]:
+        """Runs the web searches a response asks for and returns the prompt for the follow-up call.
+
+        Returns None when search is disabled or the response requests no search.
+        """
+        if not (self.search_enabled and "SEARCH_QUERIES:" in response_text):
+            return None
+        main_response, search_queries = self.parse_web_search_request(response_text)
+        chat_log.append(f"{model_type.capitalize()}: {response_text}")
+        search_output = self.perform_search(chat_log, context, search_queries, search_manager)
+        return f"{user_prompt}\n\nAdditional Information from Search Results:\n{search_output}"
+
     @staticmethod
     def parse_web_search_request(response_text: str) -> tuple:
         parts = response_text.split("SEARCH_QUERIES:")
         if len(parts) > 1:
             search_queries = [query.strip() for query in parts[1].split("|") if query.strip()]
             main_response = parts[0].strip()
-            return main_response, search_queries[:2]
+            return main_response, search_queries[:MAX_SEARCH_QUERIES_PER_REQUEST]
         return response_text, []
 
     def perform_search(
@@ -168,19 +639,126 @@ class ModelManager:
         search_manager: SearchManager,
         prompt: str = ""
     ) -> str:
-        context = generate_convo_context(prompt, chat_log)
-        results = []
-        for query in search_queries:
-            search_results = search_manager.search(query, num_results=MAX_SEARCH_RESULTS)
-            results.extend(
-                f"**{result['title']}** ({result['url']})\n{result['content']}\n"
-                for result in search_results
-            )
+        """Searches the queries and has the researcher report on the results.
 
-        researcher_model = self.get_model("researcher")
-        research_prompt = f"{context}\n\nBased on the context/conversation history and search query above, analyze the following search results and from them synthesize a relevant, useful, and comprehensive while succinct report that addresses and answers the searched query:\n\n{''.join(results)}"
-        research_response = researcher_model.generate_content(research_prompt)
-        return research_response.text if research_response.text else "No research findings."
+        In map-reduce mode every page is first digested against its query by a
+        fast model, in parallel, and the researcher synthesizes the digests
+        instead of reading the pages themselves. If no page has relevant
+        information there is nothing to synthesize; only if every digest call
+        fails does the researcher read the best passages of the pages directly.
+        """
+        context = generate_convo_context(prompt, chat_log, self.get_context_budget("researcher"))
+        # All queries are searched concurrently and pages they share are fetched once
+        results_by_query = search_manager.search_many(search_queries, num_results=MAX_SEARCH_RESULTS)
+        deduplicator = ResultDeduplicator()
+        for query, search_results in results_by_query.items():
+            results_by_query[query], stats = deduplicator.filter(search_results)
+            logger.info(
+                f"Removed {stats['exact_duplicates']} exact and {stats['near_duplicates']} near-duplicate results "
+                f"for '{query}', saving {stats['chars_saved']} characters (~{stats['tokens_saved']} tokens)")
+
+        digests = self.digest_results(results_by_query) if self.map_reduce_research else None
+        if digests is not None and not any(digests.values()):
+            return "No research findings."
+        if digests:
+            sections = []
+            for query, page_digests in digests.items():
+                sections.append(f"### Digests of the search results for: {query}\n")
+                sections.extend(f"**{result['title']}** ({result['url']})\n{digest}\n"
+                                for result, digest in page_digests)
+            research_prompt = f"{context}\n\nBased on the context/conversation history and search query above, synthesize from the following digests of the search results (the relevant information extracted from each page) a relevant, useful, and comprehensive while succinct report that addresses and answers the searched query:\n\n{''.join(sections)}"
+        else:
+            results = []
+            for query, search_results in results_by_query.items():
+                search_results = select_across_results(query, search_results, RESEARCH_CONTEXT_CHARS)
+                results.append(f"### Search results for: {query}\n")
+                results.extend(
+                    f"**{result['title']}** ({result['url']})\n{result['content']}\n"
+                    for result in search_results
+                )
+            research_prompt = f"{context}\n\nBased on the context/conversation history and search query above, analyze the following search results and from them synthesize a relevant, useful, and comprehensive while succinct report that addresses and answers the searched query:\n\n{''.join(results)}"
+        research_text = self._generate_text("researcher", research_prompt)
+        return research_text or "No research findings."
+
+    def digest_results(self, results_by_query: Dict[str, List[Dict]]) -> Optional[Dict[str, List[Tuple[Dict, str]]]]:
+        """Digests every page against the query it was found for, in parallel.
+
+        All pages are submitted at once; at most RESEARCH_DIGEST_MAX_WORKERS
+        digest calls run at the same time across all requests.
+
+        Returns:
+            Optional[Dict[str, List[Tuple[Dict, str]]]]: For each query, its
+            results that had relevant information, in rank order, with their
+            digests; None if there were no pages or every digest call failed.
+        """
+        jobs = [(query, result) for query, search_results in results_by_query.items()
+                for result in search_results if result.get('content')]
+        if not jobs:
+            return None
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(RESEARCH_DIGEST_MAX_WORKERS, len(jobs)),
+                                thread_name_prefix="digest") as executor:
+            # Each call runs in a copy of this context so it keeps the request deadline
+            futures = [executor.submit(contextvars.copy_context().run, self._digest_page, query, result)
+                       for query, result in jobs]
+        digests: Dict[str, List[Tuple[Dict, str]]] = {query: [] for query in results_by_query}
+        failures = 0
+        for (query, result), future in zip(jobs, futures):
+            digest = future.result()
+            if digest is None:
+                failures += 1
+            elif digest:
+                digests[query].append((result, digest))
+        if failures == len(jobs):
+            logger.warning(f"All {len(jobs)} digest calls failed")
+            return None
+        logger.info(f"Digested {len(jobs)} pages in {time.perf_counter() - start:.2f}s; "
+                    f"{sum(map(len, digests.values()))} had relevant information")
+        return digests
+
+    def _digest_cache_key(self, model_name: str, url: str, content: str, query: str) -> str:
+        """Keys a digest by provider, model, digest instruction and config, URL, content hash and query."""
+        _, instruction, config = self.get_model_spec("digest", model_name)
+        instruction_hash = hashlib.sha256(instruction.encode('utf-8')).hexdigest()
+        content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        payload = json.dumps(["digest", self.provider.name, model_name, instruction_hash, config, url, content_hash,
+                              query], sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _digest_page(self, query: str, result: Dict) -> Optional[str]:
+        """Returns the information on one page relevant to the query.
+
+        Returns "" if the page has nothing relevant and None if the digest call
+        fails. When the response cache is enabled for digests, a page that has
+        not changed is digested once per query and model.
+        """
+        content = select_passages(query, result['content'], RESEARCH_DIGEST_PAGE_CHARS)
+        digest_prompt = f"Search query: {query}\n\nPage: **{result['title']}** ({result['url']})\n\n{content}"
+        candidates = self.route("digest", estimate_tokens(digest_prompt))
+        cacheable = self.is_cacheable("digest")
+        if cacheable:
+            for model_name in candidates:
+                key = self._digest_cache_key(model_name, result['url'], result['content'], query)
+                if (cached := get_response_cache().get(key)) is not None:
+                    return cached
+
+        if not self._digest_slots.acquire(timeout=deadline_timeout(None)):
+            logger.warning(f"Could not digest {result['url']}: request deadline passed waiting for a digest slot")
+            return None
+        try:
+            digest, model_name = self._call_models("digest", digest_prompt, candidates)
+        except Exception as e:
+            logger.warning(f"Could not digest {result['url']}: {e}")
+            return None
+        finally:
+            self._digest_slots.release()
+        digest = digest.strip()
+        if digest.rstrip('.').upper() == self.NO_RELEVANT_INFORMATION:
+            digest = ""
+        if cacheable:
+            get_response_cache().put(self._digest_cache_key(model_name, result['url'], result['content'], query),
+                                     model_name, digest)
+        return digest
 
-def generate_convo_context(prompt: str, chat_log: List[str]) -> str:
-    return f"\nLatest Progress: {'\n'.join(chat_log[-10:])}\nTarget final output and/or instruction from the user: {prompt}"
+def generate_convo_context(prompt: str, chat_log: List[str], max_tokens: Optional[int] = None) -> str:
+    return build_context(prompt, chat_log, max_tokens)
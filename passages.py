@@ -0,0 +1,139 @@
+# passages.py
+
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from config import PASSAGE_CHARS
+
+WORD_PATTERN = re.compile(r'\w+')
+SENTENCE_END_PATTERN = re.compile(r'(?<=[.!?])\s+')
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'how', 'in', 'is', 'it', 'of', 'on', 'or',
+    'that', 'the', 'this', 'to', 'was', 'what', 'when', 'where', 'which', 'who', 'why', 'will', 'with',
+}
+PASSAGE_SEPARATOR = " ... "
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercases a text and splits it into words, dropping stopwords."""
+    return [word for word in WORD_PATTERN.findall(text.lower()) if word not in STOPWORDS]
+
+
+def split_passages(text: str, target_chars: int = PASSAGE_CHARS) -> List[str]:
+    """Splits text into passages of whole sentences of roughly ``target_chars`` each.
+
+    Sentences longer than ``target_chars`` are cut into ``target_chars`` pieces.
+    """
+    passages, current = [], ""
+    for sentence in SENTENCE_END_PATTERN.split(text.strip()):
+        for start in range(0, len(sentence), target_chars):
+            piece = sentence[start:start + target_chars]
+            if current and len(current) + len(piece) + 1 > target_chars:
+                passages.append(current)
+                current = piece
+            else:
+                current = f"{current} {piece}" if current else piece
+    if current:
+        passages.append(current)
+    return passages
+
+
+class BM25:
+    """Okapi BM25 scoring over a fixed set of tokenized passages."""
+
+    def __init__(self, passages: List[List[str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.term_counts = [Counter(tokens) for tokens in passages]
+        self.lengths = [len(tokens) for tokens in passages]
+        self.average_length = sum(self.lengths) / len(passages) if passages else 0
+        document_frequency = Counter(term for counts in self.term_counts for term in counts)
+        self.idf = {term: math.log((len(passages) - frequency + 0.5) / (frequency + 0.5) + 1)
+                    for term, frequency in document_frequency.items()}
+
+    def scores(self, query_tokens: List[str]) -> List[float]:
+        """Scores every passage against the query."""
+        terms = [term for term in set(query_tokens) if term in self.idf]
+        results = []
+        for counts, length in zip(self.term_counts, self.lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / self.average_length) if self.average_length else self.k1
+            results.append(sum(self.idf[term] * counts[term] * (self.k1 + 1) / (counts[term] + norm)
+                               for term in terms if term in counts))
+        return results
+
+
+def select_passages(query: str, text: str, max_chars: int) -> str:
+    """Returns the passages of one page most relevant to the query, within ``max_chars``.
+
+    Passages are kept in their original order. Text that already fits is returned unchanged.
+    """
+    if len(text) <= max_chars:
+        return text
+    return select_across_results(query, [{'content': text}], max_chars)[0]['content']
+
+
+def select_across_results(query: str, results: List[Dict], max_chars: int) -> List[Dict]:
+    """Fills a shared character budget with the best passages from all results.
+
+    Every result's content is split into passages and scored with BM25 against
+    the query. The budget is filled greedily by score (ties go to higher-ranked
+    results and earlier passages), and each result's content is rebuilt from
+    its chosen passages in document order. Results keep their other fields; a
+    result with no chosen passages gets empty content. If the budget is smaller
+    than every passage, the most relevant part of the best passage is kept.
+
+    Args:
+        query (str): The search query.
+        results (List[Dict]): Search results with a 'content' key, in rank order.
+        max_chars (int): Total characters of content allowed across all results.
+
+    Returns:
+        List[Dict]: Copies of the results with their content replaced by the selected passages.
+    """
+    if sum(len(result.get('content') or '') for result in results) <= max_chars:
+        return [dict(result) for result in results]
+
+    candidates: List[Tuple[int, int, str]] = []  # (result index, passage index, passage)
+    for result_index, result in enumerate(results):
+        for passage_index, passage in enumerate(split_passages(result.get('content') or '')):
+            candidates.append((result_index, passage_index, passage))
+    if not candidates:
+        return [dict(result) for result in results]
+
+    query_tokens = tokenize(query)
+    scores = BM25([tokenize(passage) for _, _, passage in candidates]).scores(query_tokens)
+    ranked = sorted(range(len(candidates)), key=lambda i: (-scores[i], candidates[i][0], candidates[i][1]))
+
+    chosen, used = [], 0
+    for i in ranked:
+        cost = len(candidates[i][2]) + len(PASSAGE_SEPARATOR)
+        if used + cost <= max_chars:
+            chosen.append(i)
+            used += cost
+    if not chosen and max_chars > 0:
+        # Nothing fits: keep the part of the best passage most relevant to the query, cut to the budget
+        result_index, passage_index, passage = candidates[ranked[0]]
+        pieces = split_passages(passage, max_chars)
+        piece_scores = BM25([tokenize(piece) for piece in pieces]).scores(query_tokens)
+        best_piece = pieces[max(range(len(pieces)), key=lambda i: (piece_scores[i], -i))]
+        candidates[ranked[0]] = (result_index, passage_index, best_piece[:max_chars])
+        chosen.append(ranked[0])
+
+    selected: Dict[int, List[Tuple[int, str]]] = {}
+    for i in chosen:
+        result_index, passage_index, passage = candidates[i]
+        selected.setdefault(result_index, []).append((passage_index, passage))
+    output = []
+    for result_index, result in enumerate(results):
+        content, previous_index = "", None
+        for passage_index, passage in sorted(selected.get(result_index, [])):
+            if previous_index is None:
+                content = passage
+            else:
+                # Adjacent passages are rejoined; gaps where text was skipped are marked
+                content += (" " if passage_index == previous_index + 1 else PASSAGE_SEPARATOR) + passage
+            previous_index = passage_index
+        output.append({**result, 'content': content})
+    return output
@@ -0,0 +1,151 @@
+# rate_limiter.py
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from datetime import date
+from typing import Dict, Optional
+
+from config import QUOTA_STATE_PATH
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket usable from both threads and asyncio.
+
+    Tokens refill at ``rate`` per second up to ``capacity``, so up to
+    ``capacity`` requests can go out back to back before the steady rate
+    applies. Waiters reserve a token up front and then sleep until it is due,
+    which keeps them in arrival order without holding the lock while waiting.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _reserve(self) -> float:
+        """Takes a token, borrowing against future refills if necessary.
+
+        Returns:
+            float: Seconds to wait before the token may be used.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def _give_back(self):
+        """Returns a reserved token that will not be used."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    def acquire(self):
+        """Takes a token, sleeping the calling thread until it is available."""
+        if wait_time := self._reserve():
+            time.sleep(wait_time)
+
+    async def acquire_async(self):
+        """Takes a token, suspending the calling coroutine until it is available.
+
+        A coroutine cancelled while waiting gives its token back.
+        """
+        if wait_time := self._reserve():
+            try:
+                await asyncio.sleep(wait_time)
+            except asyncio.CancelledError:
+                self._give_back()
+                raise
+
+
+class QuotaTracker:
+    """Daily request counters per provider, persisted to a JSON file.
+
+    Counters reset when the local date changes. Reservations are atomic, so
+    concurrent callers cannot overshoot a quota.
+    """
+
+    def __init__(self, path: str = QUOTA_STATE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._day = date.today().isoformat()
+        self._counts: Dict[str, int] = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                state = json.load(f)
+        except (IOError, json.JSONDecodeError) as e:
+            logger.error(f"Error loading quota state from {self.path}: {e}")
+            return
+        if state.get("day") == self._day:
+            self._counts = {name: int(count) for name, count in state.get("counts", {}).items()}
+
+    def _save(self):
+        try:
+            if directory := os.path.dirname(self.path):
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump({"day": self._day, "counts": self._counts}, f)
+            os.replace(temp_path, self.path)
+        except IOError as e:
+            logger.error(f"Error saving quota state to {self.path}: {e}")
+
+    def _roll_over(self):
+        today = date.today().isoformat()
+        if today != self._day:
+            self._day = today
+            self._counts = {}
+
+    def used(self, name: str) -> int:
+        """Returns today's request count for a provider."""
+        with self._lock:
+            self._roll_over()
+            return self._counts.get(name, 0)
+
+    def try_reserve(self, name: str, quota: float) -> bool:
+        """Counts one request against a provider's quota if it has any left."""
+        with self._lock:
+            self._roll_over()
+            if self._counts.get(name, 0) >= quota:
+                return False
+            self._counts[name] = self._counts.get(name, 0) + 1
+            self._save()
+            return True
+
+    def release(self, name: str):
+        """Returns a reserved request to the quota (for requests that never reached the provider)."""
+        with self._lock:
+            self._roll_over()
+            if self._counts.get(name, 0) > 0:
+                self._counts[name] -= 1
+                self._save()
+
+
+_shared_tracker: Optional[QuotaTracker] = None
+_shared_tracker_lock = threading.Lock()
+
+
+def get_quota_tracker() -> QuotaTracker:
+    """Returns the process-wide QuotaTracker, loading it on first use."""
+    global _shared_tracker
+    with _shared_tracker_lock:
+        if _shared_tracker is None:
+            _shared_tracker = QuotaTracker()
+        return _shared_tracker
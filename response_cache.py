@@ -0,0 +1,86 @@
+# response_cache.py
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+from config import RESPONSE_CACHE_PATH, RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL
+from sqlite_store import SQLiteLRUStore
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Disk-backed (SQLite) cache of model responses.
+
+    Entries are keyed by a hash of everything that determines a response:
+    model name, system instruction, generation config and prompt. They expire
+    after ``ttl`` seconds, and the least recently used entries are evicted once
+    the total stored size exceeds ``max_bytes``.
+    """
+
+    def __init__(self, path: str = RESPONSE_CACHE_PATH, max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+                 ttl: float = RESPONSE_CACHE_TTL):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._store = SQLiteLRUStore(path, "responses", {'model': "TEXT", 'response': "BLOB", 'stored_at': "REAL"},
+                                     max_bytes)
+
+    @staticmethod
+    def make_key(model_name: str, instruction: str, generation_config: Dict[str, Any], prompt: str) -> str:
+        """Hashes the inputs that determine a model response into a cache key."""
+        payload = json.dumps([model_name, instruction, generation_config, prompt], sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the cached response for a key, or None if it is missing or expired."""
+        row = self._store.get(key, ('response', 'stored_at'))
+        if row is not None and time.time() - row[1] >= self.ttl:
+            self._store.delete(key)
+            row = None
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def put(self, key: str, model_name: str, response: str):
+        """Stores a response, evicting least recently used entries to stay within max_bytes."""
+        compressed = zlib.compress(response.encode('utf-8'))
+        self._store.put(key, len(compressed), {'model': model_name, 'response': compressed, 'stored_at': time.time()})
+
+    def get_stats(self) -> Dict[str, float]:
+        """Returns hit/miss counters, the hit rate and the current stored size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                **self._store.get_stats(),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def close(self):
+        self._store.close()
+
+
+_shared_cache: Optional[ResponseCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Returns the process-wide ResponseCache, opening it on first use."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache()
+        return _shared_cache
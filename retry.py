@@ -0,0 +1,153 @@
+# retry.py
+
+import logging
+import random
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional
+
+import requests
+
+from config import MAX_RETRIES, BACKOFF_FACTOR, RETRY_BASE_DELAY, RETRY_MAX_DELAY
+
+logger = logging.getLogger(__name__)
+
+# Absolute time.monotonic() expiry of the current request, if any. Context
+# variables follow asyncio tasks, asyncio.to_thread and run_sync, so code deep
+# in the call tree sees the deadline its caller set.
+_request_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+# google.api_core exceptions for throttling and transient server failures, matched by name to avoid importing it
+RETRYABLE_ERROR_NAMES = {"ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+                         "GatewayTimeout", "DeadlineExceeded", "Aborted"}
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the request deadline passes before a step can start or retry."""
+
+
+def deadline_after(seconds: Optional[float]) -> Optional[float]:
+    """Returns the expiry ``seconds`` from now, or the current deadline if that is sooner."""
+    current = _request_deadline.get()
+    if seconds is None:
+        return current
+    expires_at = time.monotonic() + seconds
+    return expires_at if current is None else min(current, expires_at)
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float] = None, expires_at: Optional[float] = None) -> Iterator[None]:
+    """Bounds everything run inside the block by a deadline.
+
+    A nested scope can only shorten the deadline set by an outer one.
+
+    Args:
+        seconds (float, optional): Seconds from now.
+        expires_at (float, optional): Absolute time.monotonic() expiry, used instead of ``seconds``.
+    """
+    if expires_at is None:
+        expires_at = deadline_after(seconds)
+    else:
+        current = _request_deadline.get()
+        expires_at = expires_at if current is None else min(current, expires_at)
+    token = _request_deadline.set(expires_at)
+    try:
+        yield
+    finally:
+        _request_deadline.reset(token)
+
+
+def remaining_time(expires_at: Optional[float] = None) -> Optional[float]:
+    """Returns the seconds left before the deadline (the current one by default), or None if there is none."""
+    if expires_at is None:
+        expires_at = _request_deadline.get()
+    return None if expires_at is None else max(expires_at - time.monotonic(), 0.0)
+
+
+def deadline_timeout(cap: Optional[float], expires_at: Optional[float] = None) -> Optional[float]:
+    """Returns the timeout for one step: ``cap``, shortened to the time left before the deadline."""
+    remaining = remaining_time(expires_at)
+    if remaining is None:
+        return cap
+    return remaining if cap is None else min(cap, remaining)
+
+
+def check_deadline(what: str, expires_at: Optional[float] = None):
+    """Raises DeadlineExceeded if the deadline has already passed."""
+    if remaining_time(expires_at) == 0.0:
+        raise DeadlineExceeded(f"Request deadline passed before {what}")
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    if status is None and isinstance(getattr(error, 'code', None), int):
+        status = error.code  # google.api_core errors carry the HTTP status as ``code``
+    return status
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Classifies an error as transient (timeouts, connection failures, throttling, 5xx) or permanent."""
+    if isinstance(error, DeadlineExceeded):
+        return False
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    if isinstance(error, (TimeoutError, ConnectionError, requests.exceptions.ConnectionError,
+                          requests.exceptions.Timeout)):
+        return True
+    # httpx is imported lazily; if it has not been imported its errors cannot occur
+    httpx = sys.modules.get('httpx')
+    if httpx is not None and isinstance(error, httpx.TransportError):
+        return True
+    return type(error).__name__ in RETRYABLE_ERROR_NAMES
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by the request deadline.
+
+    A call is attempted up to ``max_attempts`` times. After a retryable error
+    the n-th retry waits a random time between 0 and
+    ``min(max_delay, base_delay * backoff_factor ** (n - 1))``. No retry is
+    started if its delay would run past the current deadline; the last error is
+    raised instead.
+    """
+
+    def __init__(self, max_attempts: int = MAX_RETRIES, backoff_factor: float = BACKOFF_FACTOR,
+                 base_delay: float = RETRY_BASE_DELAY, max_delay: float = RETRY_MAX_DELAY,
+                 retryable: Callable[[BaseException], bool] = is_retryable):
+        self.max_attempts = max(max_attempts, 1)
+        self.backoff_factor = backoff_factor
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retryable = retryable
+
+    def delay(self, attempt: int) -> float:
+        """Returns the seconds to wait after failed attempt number ``attempt`` (1-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * self.backoff_factor ** (attempt - 1)))
+
+    def next_delay(self, attempt: int, error: BaseException) -> Optional[float]:
+        """Returns the delay before retrying after ``error``, or None if the call should give up."""
+        if attempt >= self.max_attempts or not self.retryable(error):
+            return None
+        delay = self.delay(attempt)
+        remaining = remaining_time()
+        if remaining is not None and delay >= remaining:
+            return None
+        return delay
+
+    def call(self, func: Callable[[], Any], description: str = "call") -> Any:
+        """Runs ``func``, retrying transient failures."""
+        for attempt in range(1, self.max_attempts + 1):
+            check_deadline(description)
+            try:
+                return func()
+            except Exception as e:
+                delay = self.next_delay(attempt, e)
+                if delay is None:
+                    raise
+                logger.warning(f"{description} failed (attempt {attempt}): {e}. Retrying in {delay:.1f}s")
+                time.sleep(delay)
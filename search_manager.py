@@ -1,27 +1,41 @@
-from certifi import contents
+import asyncio
 import requests
-from bs4 import BeautifulSoup, Comment
 import time
 import re
-from urllib.parse import urlparse
-from typing import List, Dict, Any
+from urllib.parse import urljoin, urlparse
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
+from collections import OrderedDict, deque
 import logging
 from dotenv import load_dotenv
 import os
 from abc import ABC, abstractmethod
-from fake_useragent import UserAgent
-import html2text
-from duckduckgo_search import DDGS
 import random
-from selenium import webdriver
-from selenium.webdriver.edge.options import Options
-from selenium.webdriver.edge.service import Service
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
-import gzip
-#$end
-from newspaper import Article
+import codecs
+import threading
+import weakref
+
+from config import (FETCH_MAX_WORKERS, FETCH_PER_HOST_LIMIT, FETCH_DEADLINE, CONTENT_CACHE_ENABLED,
+                    QUERY_CACHE_MAX_BYTES, QUERY_CACHE_TTL, QUERY_CACHE_STALE_TTL,
+                    SEARCH_HEDGED, SEARCH_HEDGE_PERCENTILE, SEARCH_HEDGE_DEFAULT_DELAY, SEARCH_HEDGE_MIN_SAMPLES,
+                    SEARCH_RATE_BURST, PASSAGE_CANDIDATE_CHARS, FOIA_SEARCH_URL, FOIA_MAX_DOCUMENTS, FOIA_DEADLINE,
+                    TIMEOUT, BROWSER_MIN_TIME)
+from async_runtime import run_sync
+from content_cache import ContentCache
+from extraction import get_extraction_backend
+from health import HealthRegistry, get_health_registry
+from http_client import get_async_http_client, get_http_client, normalize_url
+from passages import select_passages
+from rate_limiter import TokenBucket, get_quota_tracker
+from retry import RetryPolicy, check_deadline, deadline_timeout, remaining_time
+
+# Heavy optional dependencies (selenium, newspaper, duckduckgo_search, fake_useragent, bs4)
+# are imported where they are used, so importing this module stays fast
+if TYPE_CHECKING:
+    from browser_pool import BrowserPool
 
 def fetch_article_text(url):
+    from newspaper import Article
+
     article = Article(url)
     article.download()
     article.parse()
@@ -54,6 +68,7 @@ BRAVE_SEARCH_API_KEY = os.getenv('BRAVE_SEARCH_API_KEY')  # Brave Search API key
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)  # Get a logger instance
+logging.getLogger("httpx").setLevel(logging.WARNING)  # httpx logs every request at INFO
 
 # --- [Improved] More descriptive error handling ---
 def initialize_apis() -> List['SearchAPI']:
@@ -117,14 +132,33 @@ def configure_search_settings() -> Dict[str, Any]:
             print(f"An error occurred: {e}. Please try again.")
 
 
+class SearchSkipped(Exception):
+    """Raised by a provider that skipped a search without sending a request, e.g. out of quota or time."""
+
+
+class SearchFailed(Exception):
+    """Raised by a provider whose search request failed or whose answer could not be read."""
+
+
 class SearchProvider(ABC):
     """Abstract base class for search providers."""
 
     @abstractmethod
     def search(self, query: str, num_results: int) -> List['SearchResult']:
-        """Perform a search and return a list of SearchResult objects."""
+        """Perform a search and return a list of SearchResult objects.
+
+        An empty list means the query had no hits; errors raise SearchFailed.
+        """
         pass 
 
+    async def asearch(self, query: str, num_results: int) -> List['SearchResult']:
+        """Performs a search without blocking the event loop.
+
+        Runs ``search`` on a worker thread; providers with a native async
+        implementation override this.
+        """
+        return await asyncio.to_thread(self.search, query, num_results)
+
 
 class SearchResult:
     """Represents a single search result."""
@@ -137,7 +171,12 @@ class SearchResult:
 
 
 class SearchAPI(SearchProvider):
-    """Represents a search API with rate limiting and quota management."""
+    """Represents a search API with rate limiting and quota management.
+
+    ``rate_limit`` is the minimum average number of seconds between requests;
+    up to SEARCH_RATE_BURST requests may go out back to back. ``quota`` is the
+    number of requests allowed per day, tracked on disk across restarts.
+    """
 
     def __init__(self, name: str, api_key: str, base_url: str, params: dict, quota: int, results_path: str,
                  rate_limit: int):
@@ -148,25 +187,64 @@ class SearchAPI(SearchProvider):
         if api_key:
             self.params['key'] = api_key
         self.quota = quota
-        self.used = 0
+        self.quota_tracker = get_quota_tracker()
         self.results_path = results_path
         self.rate_limit = rate_limit
-        self.last_request_time = 0
-        self.user_agent_rotator = UserAgent()
+        self.rate_limiter = TokenBucket(1 / rate_limit, SEARCH_RATE_BURST) if rate_limit > 0 else None
+
+    _user_agent_rotator = None
+    _user_agent_lock = threading.Lock()
+
+    @property
+    def user_agent_rotator(self):
+        """Shared fake_useragent rotator, created on first use since loading its data is slow."""
+        if SearchAPI._user_agent_rotator is None:
+            with SearchAPI._user_agent_lock:
+                if SearchAPI._user_agent_rotator is None:
+                    from fake_useragent import UserAgent
+                    SearchAPI._user_agent_rotator = UserAgent()
+        return SearchAPI._user_agent_rotator
+
+    @property
+    def used(self) -> int:
+        """Number of requests made to this API today."""
+        return self.quota_tracker.used(self.name)
 
     def is_within_quota(self) -> bool:
-        """Checks if the API is within its usage quota."""
+        """Checks if the API is within its usage quota. Never blocks on the rate limiter."""
         return self.used < self.quota
 
-    def respect_rate_limit(self):
-        """Pauses execution to respect the API's rate limit."""
-        time_since_last_request = time.time() - self.last_request_time
-        if time_since_last_request < self.rate_limit:
-            time.sleep(self.rate_limit - time_since_last_request)
-
     def search(self, query: str, num_results: int) -> List[SearchResult]:
-        """Performs a search using the API."""
-        self.respect_rate_limit()
+        """Performs a search using the API. A skipped search gives an empty list."""
+        try:
+            return run_sync(self.asearch(query, num_results))
+        except SearchSkipped as e:
+            logger.warning(str(e))
+            return []
+
+    async def asearch(self, query: str, num_results: int) -> List[SearchResult]:
+        """Performs a search using the API on the shared async HTTP client.
+
+        The request gets TIMEOUT seconds, or less if the request deadline is closer.
+
+        Raises:
+            SearchSkipped: If the request deadline has passed or the daily quota is used up.
+            SearchFailed: If the request fails or the answer is not valid JSON.
+        """
+        import httpx
+
+        timeout = deadline_timeout(TIMEOUT)
+        if timeout == 0:
+            raise SearchSkipped(f"Skipping {self.name} search: request deadline has passed")
+        if not self.is_within_quota():
+            raise SearchSkipped(f"Skipping {self.name} search: daily quota of {self.quota} requests is used up")
+        if self.rate_limiter:
+            await self.rate_limiter.acquire_async()
+            if deadline_timeout(timeout) == 0:
+                raise SearchSkipped(f"Skipping {self.name} search: request deadline passed waiting on the rate limit")
+        # Reserved only once the request is about to be sent, so a search cancelled while waiting costs no quota
+        if not self.quota_tracker.try_reserve(self.name, self.quota):
+            raise SearchSkipped(f"Skipping {self.name} search: daily quota of {self.quota} requests is used up")
         logger.info(f"Searching {self.name} for: {query}")
         params = self.params.copy()
         params['q'] = query
@@ -175,38 +253,47 @@ class SearchAPI(SearchProvider):
         params['num'] = min(num_results, 10) if self.name == 'Google' else num_results
         headers = {'User-Agent': self.user_agent_rotator.random}
         try:
-            response = requests.get(self.base_url, params=params, headers=headers, timeout=10)
+            response = await get_async_http_client().get(self.base_url, params=params, headers=headers,
+                                                       timeout=deadline_timeout(timeout))
             response.raise_for_status()
-            self.used += 1
-            self.last_request_time = time.time()
             data = response.json()
-
-            results = []
-            for item in data.get(self.results_path, []):
-                url = item.get('link') or item.get('url')
-                title = item.get('title') or "No title"
-                snippet = item.get('snippet') or "No snippet"
-                results.append(SearchResult(title, url, snippet))
-            return results
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error during {self.name} search: {e}")
-            return []
+        except httpx.HTTPError as e:
+            if isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+                # The request was never sent, so it does not count against the quota. Any later error
+                # (a read timeout, a dropped connection) may come after the provider has billed it.
+                self.quota_tracker.release(self.name)
+            raise SearchFailed(f"Error during {self.name} search: {e}") from e
+        except ValueError as e:
+            raise SearchFailed(f"Invalid response from {self.name} search: {e}") from e
+
+        results = []
+        for item in data.get(self.results_path, []):
+            url = item.get('link') or item.get('url')
+            title = item.get('title') or "No title"
+            snippet = item.get('snippet') or "No snippet"
+            results.append(SearchResult(title, url, snippet))
+        return results
 
 
 class DuckDuckGoSearchProvider(SearchProvider):
     """Provides search functionality using DuckDuckGo."""
 
     def search(self, query: str, max_results: int) -> List[SearchResult]:
-        """Searches DuckDuckGo and returns a list of SearchResult objects."""
+        """Searches DuckDuckGo and returns a list of SearchResult objects.
+
+        Raises:
+            SearchFailed: If the search fails.
+        """
         try:
+            from duckduckgo_search import DDGS
+
             sanitized_query = self._sanitize_query(query)
             with DDGS() as ddgs:
                 results = list(ddgs.text(sanitized_query, region='wt-wt', safesearch='off', timelimit='y'))[
                           :max_results]
             return [SearchResult(r['title'], r['href'], r['body']) for r in results]
         except Exception as e:
-            logging.error(f"Error searching DuckDuckGo: {e}")
-            return []
+            raise SearchFailed(f"Error searching DuckDuckGo: {e}") from e
 
     def _sanitize_query(self, query: str) -> str:
         """Sanitizes the search query for DuckDuckGo."""
@@ -219,6 +306,17 @@ class WebContentExtractor:
     """Extracts web content from a given URL."""
     MAX_RETRIES = 2
     TIMEOUT = 5
+    RETRY_POLICY = RetryPolicy(max_attempts=MAX_RETRIES)
+    MAX_PAGE_BYTES = 2 * 1024 * 1024  # Stop downloading a page after this many (decoded) bytes
+    CHUNK_SIZE = 64 * 1024
+    FIRST_CHECKPOINT = 128 * 1024  # Bytes read before the first early-cutoff extraction
+    BINARY_EXTENSIONS = {
+        '.pdf', '.zip', '.gz', '.tgz', '.tar', '.rar', '.7z', '.exe', '.msi', '.dmg', '.iso', '.bin', '.apk',
+        '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ico', '.bmp', '.tif', '.tiff',
+        '.mp3', '.wav', '.ogg', '.flac', '.mp4', '.m4a', '.avi', '.mov', '.mkv', '.webm',
+        '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.odt', '.epub',
+        '.css', '.js', '.woff', '.woff2', '.ttf', '.otf', '.eot',
+    }
     USER_AGENTS = [
         'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
         'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Safari/605.1.15',
@@ -230,170 +328,255 @@ class WebContentExtractor:
         'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36 Edg/91.0.864.59',
         'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36 OPR/78.0.4093.147',
     ]
-        # Class variable to hold the WebDriver instance
-    _driver = None
+    # Shared headless browser pool for the Selenium fallback, started on first use
+    _browser_pool = None
+    _browser_pool_lock = threading.Lock()
+    # Shared on-disk page cache, opened on first use
+    _cache = None
+    _cache_lock = threading.Lock()
 
     @classmethod
-    def _initialize_driver(cls):
-        """Initializes the Selenium WebDriver if it hasn't been created yet."""
-        if cls._driver is None:
-            edge_options = Options()
-            edge_options.add_argument("--headless=new")
-            edge_options.add_argument("--disable-gpu")
-            edge_options.add_argument("--no-sandbox")
-            user_agent = random.choice(cls.USER_AGENTS)
-            edge_options.add_argument(f"user-agent={user_agent}")
-
-            # Set up the WebDriver for Edge
-            cls._driver = webdriver.Edge(service=Service(EdgeChromiumDriverManager().install()), options=edge_options)
+    def get_cache(cls) -> Optional[ContentCache]:
+        """Returns the shared content cache, or None if caching is disabled."""
+        if cls._cache is None and CONTENT_CACHE_ENABLED:
+            with cls._cache_lock:
+                if cls._cache is None:
+                    cls._cache = ContentCache()
+        return cls._cache
+
+    @staticmethod
+    def browser_headers() -> Dict[str, str]:
+        """Returns browser-like request headers with a random User-Agent.
+
+        Accept-Encoding and keep-alive are handled by the shared HTTP client.
+        """
+        return {
+            'User-Agent': random.choice(WebContentExtractor.USER_AGENTS),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Upgrade-Insecure-Requests': '1',
+            'Cache-Control': 'max-age=0',
+            'DNT': '1',
+        }
+
+    @classmethod
+    def get_browser_pool(cls) -> 'BrowserPool':
+        """Returns the shared browser pool, creating it on first use."""
+        if cls._browser_pool is None:
+            with cls._browser_pool_lock:
+                if cls._browser_pool is None:
+                    from browser_pool import BrowserPool
+
+                    cls._browser_pool = BrowserPool(cls.USER_AGENTS)
+        return cls._browser_pool
 
     @classmethod
     def extract_with_selenium(cls, url: str) -> str:
-        """Extracts content using Selenium as a fallback."""
-        cls._initialize_driver()  # Ensure the driver is initialized
+        """Extracts content using a pooled headless browser as a fallback.
+
+        Skipped when less than BROWSER_MIN_TIME seconds remain before the request
+        deadline; otherwise page loads are bounded by the time left.
+        """
+        remaining = remaining_time()
+        if remaining is not None and remaining < BROWSER_MIN_TIME:
+            logging.warning(f"Skipping browser fallback for {url}: request deadline is too close")
+            return ""
         try:
-            cls._driver.get(url)
-            time.sleep(5)  # Wait for the page to load
-            html_content = cls._driver.page_source
-            soup = BeautifulSoup(html_content, 'html.parser')
-            main_content = soup.find(['div', 'main', 'article'],
-                                      class_=re.compile(r'content|main-content|post-content', re.IGNORECASE)) or soup.body
-            main_text = main_content.get_text(separator=' ', strip=True) if main_content else ''
-            return re.sub(r'\s+', ' ', main_text)
+            from selenium.common.exceptions import TimeoutException
+
+            pool = cls.get_browser_pool()
+            with pool.page() as driver:
+                check_deadline(f"loading {url} in a browser")
+                page_timeout = deadline_timeout(pool.page_timeout)
+                driver.set_page_load_timeout(page_timeout)
+                try:
+                    driver.get(url)
+                except TimeoutException:
+                    # Keep whatever has rendered so far rather than losing the page
+                    logging.warning(f"Page load timed out for {url}, using partially loaded content")
+                    driver.execute_script("window.stop();")
+                pool.wait_until_ready(driver, deadline_timeout(page_timeout))
+                html_content = driver.page_source
+            return get_extraction_backend().extract(html_content)
         except Exception as e:
             logging.error(f"Selenium extraction failed for {url}: {e}")
             return ""
 
     @classmethod
     def quit_driver(cls):
-        """Quits the WebDriver if it is running."""
-        if cls._driver is not None:
-            cls._driver.quit()
-            cls._driver = None  # Reset the driver to None after quitting
-            
+        """Shuts down the browser pool if it is running."""
+        with cls._browser_pool_lock:
+            if cls._browser_pool is not None:
+                cls._browser_pool.shutdown()
+                cls._browser_pool = None
+
+    @staticmethod
+    def extract_content(url: str, max_chars: Optional[int] = None) -> str:
+        """Extracts content from the given URL. Blocking wrapper around ``aextract``."""
+        return run_sync(WebContentExtractor.aextract(url, max_chars))
+
     @staticmethod
-    def extract_content(url: str) -> str:
-        """Extracts content from the given URL using requests and BeautifulSoup.
-        Falls back to Selenium if requests fails or returns insufficient content.
+    async def aextract(url: str, max_chars: Optional[int] = None, timeout: Optional[float] = None) -> str:
+        """Extracts content from the given URL using the async HTTP client and the configured extraction backend.
+        Falls back to Selenium if the request fails or returns insufficient content.
+
+        Pages are served from the content cache while fresh, and stale cached
+        pages are revalidated with a conditional request before re-downloading.
+        The body is streamed: URLs with binary file extensions and non-HTML
+        responses are skipped before it is read, and reading stops at
+        MAX_PAGE_BYTES or once ``max_chars`` of text has been extracted.
+        Cancelling the coroutine closes the connection it is reading from.
 
         Args:
             url (str): The URL to extract content from.
+            max_chars (int, optional): Stop downloading once this much text is available.
+            timeout (float, optional): Seconds allowed for the whole extraction, retries included.
 
         Returns:
-            str: The extracted content, or an empty string if extraction fails. 
+            str: The extracted content, or an empty string if extraction fails or times out.
         """
+        if timeout is None:
+            return await WebContentExtractor._aextract(url, max_chars)
+        try:
+            return await asyncio.wait_for(WebContentExtractor._aextract(url, max_chars), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Extraction of {url} timed out after {timeout}s")
+            return ""
+
+    @staticmethod
+    async def _aextract(url: str, max_chars: Optional[int]) -> str:
+        import httpx
+
         if not WebContentExtractor.is_valid_url(url):
             logger.error(f"Invalid URL: {url}")
             return ""
+        if WebContentExtractor.is_binary_url(url):
+            logger.info(f"Skipping binary file: {url}")
+            return ""
 
-        for attempt in range(1, WebContentExtractor.MAX_RETRIES + 1):
+        # The SQLite cache and the browser block, so they run on worker threads
+        cache = WebContentExtractor.get_cache()
+        cached = await asyncio.to_thread(cache.get, url) if cache else None
+        if cached and cached.is_fresh():
+            return cached.text
+
+        health = get_health_registry()
+        domain_key = HealthRegistry.domain_key(urlparse(url).netloc)
+        policy = WebContentExtractor.RETRY_POLICY
+        for attempt in range(1, policy.max_attempts + 1):
+            timeout = deadline_timeout(WebContentExtractor.TIMEOUT)
+            if timeout == 0:
+                logging.warning(f"Skipping {url}: request deadline has passed")
+                return cached.text if cached and not cached.must_revalidate() else ""
+            if not health.allow(domain_key):
+                logging.warning(f"Skipping {url}: circuit for its domain is open")
+                return cached.text if cached and not cached.must_revalidate() else ""
+            start = time.monotonic()
             try:
-                headers = {
-                    'User-Agent': random.choice(WebContentExtractor.USER_AGENTS),
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept-Encoding': 'gzip, deflate, br',
-                    'Connection': 'keep-alive',
-                    'Upgrade-Insecure-Requests': '1',
-                    'Cache-Control': 'max-age=0',
-                    'DNT': '1',
-                }
-                response = requests.get(url, headers=headers, timeout=WebContentExtractor.TIMEOUT)
-                response.raise_for_status()
-                content_type = response.headers.get('Content-Type', '').lower()
-                if 'text/html' not in content_type:
-                    logger.warning(f"Non-HTML content returned for {url}: {content_type}")
+                headers = WebContentExtractor.browser_headers()
+                if cached:
+                    headers.update(cached.validators())
+                async with get_async_http_client().stream(url, headers=headers, timeout=timeout) as response:
+                    # Server errors and throttling count against the domain; other statuses mean it is up
+                    if response.status_code >= 500 or response.status_code == 429:
+                        health.record_failure(domain_key, time.monotonic() - start)
+                    else:
+                        health.record_success(domain_key, time.monotonic() - start)
+                    if cached and response.status_code == 304:
+                        await asyncio.to_thread(cache.revalidated, url, response.headers)
+                        return cached.text
+                    response.raise_for_status()
+                    content_type = response.headers.get('Content-Type', '').lower()
+                    if 'text/html' not in content_type:
+                        logger.warning(f"Non-HTML content returned for {url}: {content_type}")
+                        if cache:
+                            await asyncio.to_thread(cache.store, url, response.headers, b"", "")
+                        return ""
+
+                    # Content-Encoding (gzip/deflate/br) is decoded by the HTTP client
+                    body, text = await WebContentExtractor._read_html(response, content_type, max_chars)
+
+                if len(text.strip()) < 200:
+                    logging.warning(
+                        f"Insufficient content extracted with requests (attempt {attempt}), falling back to Selenium for {url}")
+                    text = await asyncio.to_thread(WebContentExtractor.extract_with_selenium, url)
+                if cache and text:
+                    await asyncio.to_thread(cache.store, url, response.headers, body, text)
+                return text
+
+            except httpx.HTTPError as e:
+                if not isinstance(e, httpx.HTTPStatusError):
+                    health.record_failure(domain_key, time.monotonic() - start)
+                delay = None if health.is_open(domain_key) else policy.next_delay(attempt, e)
+                if delay is not None:
+                    logging.warning(f"Error with requests for {url} (attempt {attempt}): {e}. "
+                                    f"Retrying in {delay:.1f}s...")
+                    await asyncio.sleep(delay)
+                elif cached and not cached.must_revalidate():
+                    logging.warning(f"Error with requests for {url}: {e}. Serving stale cached content.")
+                    return cached.text
+                elif health.is_open(domain_key):
+                    logging.warning(f"Error with requests for {url}: {e}. Domain is failing, skipping Selenium.")
                     return ""
-
-                # Handle gzip encoding
-                if response.headers.get('content-encoding') == 'gzip':
-                    try:
-                        html_content = gzip.decompress(response.content).decode('utf-8', errors='ignore')
-                    except (OSError, gzip.BadGzipFile) as e:
-                        logger.warning(f"Error decoding gzip content: {e}. Using raw content.")
-                        html_content = response.text 
                 else:
-                    html_content = response.text
+                    logging.warning(
+                        f"Error with requests for {url} after {attempt} attempts: {e}. Falling back to Selenium.")
+                    return await asyncio.to_thread(WebContentExtractor.extract_with_selenium, url)
 
-                soup = BeautifulSoup(html_content, 'html.parser')
-                text = WebContentExtractor._extract_content_from_soup(soup)
+    @staticmethod
+    async def _read_html(response, content_type: str, max_chars: Optional[int]) -> Tuple[bytes, str]:
+        """Streams an HTML response body and extracts its text, stopping early when possible.
 
-                if len(text.strip()) >= 200:
-                    return text
-                logging.warning(
-                    f"Insufficient content extracted with requests (attempt {attempt}), falling back to Selenium for {url}")
-                return WebContentExtractor.extract_with_selenium(url)
+        Reading stops after MAX_PAGE_BYTES, or once the text extracted from the bytes
+        read so far reaches ``max_chars``. The early checks run at doubling byte
+        checkpoints, so together they cost at most about one extra extraction.
+
+        Returns:
+            Tuple[bytes, str]: The bytes read and the extracted text.
+        """
+        backend = get_extraction_backend()
+        content_length = response.headers.get('Content-Length', '')
+        if content_length.isdigit() and int(content_length) > WebContentExtractor.MAX_PAGE_BYTES:
+            logger.info(f"Reading only the first {WebContentExtractor.MAX_PAGE_BYTES} of {content_length} bytes "
+                        f"from {response.url}")
+
+        chunks, size, encoding = [], 0, None
+        checkpoint = WebContentExtractor.FIRST_CHECKPOINT
+        async for chunk in response.aiter_bytes(chunk_size=WebContentExtractor.CHUNK_SIZE):
+            chunks.append(chunk)
+            size += len(chunk)
+            encoding = encoding or WebContentExtractor._detect_encoding(content_type, chunk)
+            if size >= WebContentExtractor.MAX_PAGE_BYTES:
+                break
+            if max_chars and size >= checkpoint:
+                checkpoint *= 2
+                body = b''.join(chunks)
+                text = backend.extract(body.decode(encoding, errors='replace'))
+                if len(text) >= max_chars:
+                    return body, text
+
+        body = b''.join(chunks)[:WebContentExtractor.MAX_PAGE_BYTES]
+        return body, backend.extract(body.decode(encoding or 'utf-8', errors='replace'))
 
-            except requests.exceptions.RequestException as e:
-                if attempt < WebContentExtractor.MAX_RETRIES:
-                    logging.warning(f"Error with requests for {url} (attempt {attempt}): {e}. Retrying...")
-                    time.sleep(2 ** attempt)  # Exponential backoff
-                else:
-                    logging.warning(
-                        f"Error with requests for {url} after {WebContentExtractor.MAX_RETRIES} attempts: {e}. Falling back to Selenium.")
-                    return WebContentExtractor.extract_with_selenium(url)
-        
     @staticmethod
-    def _extract_content_from_soup(soup: BeautifulSoup) -> str:
-        """Helper method to extract and clean content from BeautifulSoup object."""
-        for element in soup(['nav', 'header', 'footer', 'aside', 'script', 'style']):
-            element.decompose()
-
-        for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
-            comment.extract()
-
-        content = soup.find('main') or soup.find('article') or soup.find(
-            'div', class_=re.compile(r'content|main-content|post-content|body|main-body|body-content|main', re.IGNORECASE))
-
-        if not content:
-            content = soup.body
-
-        if content:
-            h = html2text.HTML2Text()
-            h.ignore_links = True
-            h.ignore_images = True
-            text = h.handle(str(content))
-
-            text = re.sub(r'\n+', '\n', text)
-            text = re.sub(r'\s+', ' ', text)
-            text = text.strip()
-            return text
-        else:
-            return ""
+    def _detect_encoding(content_type: str, head: bytes) -> str:
+        """Finds a page's character encoding from its Content-Type or <meta> tag, defaulting to UTF-8."""
+        match = re.search(r'charset=["\']?([\w-]+)', content_type)
+        if not match:
+            match = re.search(rb'<meta[^>]+charset=["\']?([\w-]+)', head[:4096], re.IGNORECASE)
+        if match:
+            encoding = match.group(1)
+            encoding = encoding.decode('ascii') if isinstance(encoding, bytes) else encoding
+            try:
+                return codecs.lookup(encoding).name
+            except LookupError:
+                pass
+        return 'utf-8'
 
     @staticmethod
-    def extract_with_selenium(url: str) -> str:
-        """Extracts content using Selenium as a fallback."""
-        try:
-            # Set up Edge options for headless browsing
-            edge_options = Options()
-            edge_options.add_argument("--headless=new") 
-            edge_options.add_argument("--disable-gpu")
-            edge_options.add_argument("--no-sandbox")
-            user_agent = random.choice(WebContentExtractor.USER_AGENTS)
-            edge_options.add_argument(f"user-agent={user_agent}") 
-
-            # Set up the WebDriver for Edge
-            service = Service(EdgeChromiumDriverManager().install())
-            driver = webdriver.Edge(service=service, options=edge_options)
-
-            driver.get(url)
-            time.sleep(5) 
-            html_content = driver.page_source
-            
-
-            soup = BeautifulSoup(html_content, 'html.parser')
-            main_content = soup.find(['div', 'main', 'article'],
-                                    class_=re.compile(r'content|main-content|post-content',
-                                                      re.IGNORECASE)) or soup.body
-            main_text = main_content.get_text(separator=' ', strip=True) if main_content else ''
-            return re.sub(r'\s+', ' ', main_text)
-                
-        except Exception as e:
-            logging.error(f"Selenium extraction failed for {url}: {e}")
-            return ""
-        finally:
-            WebContentExtractor.quit_driver()  # Ensure the driver is quit at the end
+    def is_binary_url(url: str) -> bool:
+        """Checks if a URL points at a file type that is never an HTML page."""
+        return os.path.splitext(urlparse(url).path.lower())[1] in WebContentExtractor.BINARY_EXTENSIONS
 
     @staticmethod
     def is_valid_url(url: str) -> bool:
@@ -404,22 +587,194 @@ class WebContentExtractor:
         except ValueError:
             return False
 
+class QueryCache:
+    """In-memory LRU cache of search results with TTL expiry, bounded by total size.
+
+    Entries younger than ``ttl`` seconds are fresh. Entries older than that but
+    younger than ``ttl + stale_ttl`` are still served, flagged as stale so the
+    caller can refresh them in the background (stale-while-revalidate).
+    """
+
+    def __init__(self, max_bytes: int = QUERY_CACHE_MAX_BYTES, ttl: float = QUERY_CACHE_TTL,
+                 stale_ttl: float = QUERY_CACHE_STALE_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()  # key -> (results, size, stored_at)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(query: str, num_results: int) -> Tuple[str, int]:
+        """Builds a cache key that ignores case and whitespace differences in the query."""
+        return re.sub(r'\s+', ' ', query).strip().lower(), num_results
+
+    @staticmethod
+    def _estimate_size(results: List[Dict]) -> int:
+        """Estimates the memory held by a result list from its string fields."""
+        return sum(len(str(value).encode('utf-8')) for result in results for value in result.values())
+
+    def get(self, key: Tuple[str, int]) -> Tuple[Optional[List[Dict]], bool]:
+        """Looks up cached results.
+
+        Returns:
+            Tuple[Optional[List[Dict]], bool]: The results (None on a miss) and
+                                               whether they are stale.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                results, size, stored_at = entry
+                age = time.time() - stored_at
+                if age < self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    stale = age >= self.ttl
+                    if stale:
+                        self.stale_hits += 1
+                    else:
+                        self.hits += 1
+                    return [dict(result) for result in results], stale
+                del self._entries[key]
+                self._total_bytes -= size
+            self.misses += 1
+            return None, False
+
+    def put(self, key: Tuple[str, int], results: List[Dict]):
+        """Stores results, evicting least recently used entries to stay within max_bytes."""
+        size = self._estimate_size(results)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = ([dict(result) for result in results], size, time.time())
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
+    def get_stats(self) -> Dict[str, int]:
+        """Returns hit/miss counters and the current cache size."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+            }
+
+
+class PageFetcher:
+    """Fetches the text of many pages concurrently.
+
+    Each page is a coroutine on the shared async HTTP client. At most
+    ``max_workers`` pages of a batch are fetched at once, and at most
+    ``per_host_limit`` pages per host across all batches on the same event loop.
+    Each batch is bounded by ``deadline`` seconds, or the time left before the
+    request deadline if that is sooner; pages still pending at the deadline are
+    cancelled and come back empty.
+    """
+
+    def __init__(self, extractor: WebContentExtractor, max_workers: int = FETCH_MAX_WORKERS,
+                 per_host_limit: int = FETCH_PER_HOST_LIMIT, deadline: float = FETCH_DEADLINE):
+        self.extractor = extractor
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.deadline = deadline
+        # asyncio semaphores belong to one event loop, so the per-host limits are kept per loop
+        self._host_semaphores = weakref.WeakKeyDictionary()  # loop -> {host: asyncio.Semaphore}
+        self._host_lock = threading.Lock()
+
+    def fetch(self, urls: List[str], max_chars: Optional[int] = None) -> List[str]:
+        """Extracts the text of every URL. Blocking wrapper around ``afetch``."""
+        return run_sync(self.afetch(urls, max_chars))
+
+    async def afetch(self, urls: List[str], max_chars: Optional[int] = None) -> List[str]:
+        """Extracts the text of every URL.
+
+        Args:
+            urls (List[str]): The pages to fetch.
+            max_chars (Optional[int]): Maximum characters extracted per page.
+
+        Returns:
+            List[str]: The text of each page, in the same order as ``urls``;
+                       empty for pages that failed or missed the deadline.
+        """
+        if not urls:
+            return []
+
+        workers = asyncio.Semaphore(self.max_workers)
+
+        async def fetch_one(url: str) -> str:
+            # Wait for the host slot first so pages queued behind a busy host do not hold worker slots
+            async with self._host_semaphore(url), workers:
+                return await self.extractor.aextract(url, max_chars=max_chars)
+
+        deadline = deadline_timeout(self.deadline)
+        tasks = [asyncio.create_task(fetch_one(url)) for url in urls]
+        done, not_done = await asyncio.wait(tasks, timeout=deadline)
+        for task in not_done:
+            task.cancel()
+        if not_done:
+            logger.warning(f"{len(not_done)} of {len(tasks)} pages missed the {deadline:.1f}s fetch deadline")
+
+        contents = []
+        for url, task in zip(urls, tasks):
+            content = ""
+            if task in done:
+                try:
+                    content = task.result() or ""
+                except Exception as e:
+                    logger.error(f"Error extracting content from {url}: {e}")
+            contents.append(content)
+        return contents
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Returns the semaphore limiting concurrent fetches to the URL's host on the running loop."""
+        host = urlparse(url or "").netloc.lower()
+        loop = asyncio.get_running_loop()
+        with self._host_lock:
+            semaphores = self._host_semaphores.setdefault(loop, {})
+            semaphore = semaphores.get(host)
+            if semaphore is None:
+                semaphore = semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+            return semaphore
+
+
 class SearchManager:
     """Manages searches across multiple APIs and providers."""
 
     def __init__(self, apis: List[SearchAPI], web_search_provider: SearchProvider, max_content_length: int = 10000,
-                 cache_size: int = 100):
+                 cache_max_bytes: int = QUERY_CACHE_MAX_BYTES, cache_ttl: float = QUERY_CACHE_TTL,
+                 cache_stale_ttl: float = QUERY_CACHE_STALE_TTL, max_workers: int = FETCH_MAX_WORKERS,
+                 per_host_limit: int = FETCH_PER_HOST_LIMIT, fetch_deadline: float = FETCH_DEADLINE,
+                 hedged: bool = SEARCH_HEDGED, candidate_length: int = PASSAGE_CANDIDATE_CHARS):
         self.apis = apis
         self.web_search_provider = web_search_provider
         self.content_extractor = WebContentExtractor()
         self.max_content_length = max_content_length
-        self.cache = {}
-        self.cache_size = cache_size
+        self.candidate_length = max(candidate_length, max_content_length)
+        self.cache = QueryCache(cache_max_bytes, cache_ttl, cache_stale_ttl)
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self._background_tasks = set()
+        self.fetcher = PageFetcher(self.content_extractor, max_workers, per_host_limit, fetch_deadline)
+        self.hedged = hedged
+        self.health = get_health_registry()
+        self._provider_latencies: Dict[str, deque] = {}
+        self._latency_lock = threading.Lock()
 
     def search(self, query: str, num_results: int = 5):
         """
         Performs a search using available APIs and the web search provider.
 
+        Blocking wrapper around ``asearch``; the work runs on the shared
+        background event loop.
+
         Args:
             query (str): The search query.
             num_results (int, optional): The maximum number of results to return. 
@@ -429,6 +784,147 @@ class SearchManager:
             List[Dict]: A list of dictionaries, each representing a search result 
                         with 'title', 'url', 'snippet', and 'content' keys. 
         """
+        return run_sync(self.asearch(query, num_results))
+
+    async def asearch(self, query: str, num_results: int = 5, timeout: Optional[float] = None) -> List[Dict]:
+        """Performs a search without blocking the event loop.
+
+        Many searches can run concurrently on one loop; their page fetches share
+        the async HTTP client's connection pool. Cancelling the coroutine cancels
+        its in-flight provider requests and page fetches.
+
+        Args:
+            query (str): The search query.
+            num_results (int, optional): The maximum number of results to return. Defaults to 5.
+            timeout (float, optional): Seconds allowed for the whole search, page fetches included.
+                Shortened to the time left before the request deadline, if one is set.
+
+        Returns:
+            List[Dict]: The search results, as for ``search``. Empty if the search times out.
+        """
+        timeout = deadline_timeout(timeout)
+        key = QueryCache.make_key(query, num_results)
+        cached_results, stale = self.cache.get(key)
+        if cached_results is not None:
+            logging.info(f"Serving {'stale ' if stale else ''}cached results for query: {query}")
+            if stale:
+                self._refresh_in_background(query, num_results)
+            return cached_results
+        if timeout is None:
+            return await self._search_uncached(query, num_results)
+        try:
+            return await asyncio.wait_for(self._search_uncached(query, num_results), timeout)
+        except asyncio.TimeoutError:
+            logging.warning(f"Search for {query} timed out after {timeout}s")
+            return []
+
+    def _refresh_in_background(self, query: str, num_results: int):
+        """Re-runs a search as a background task on the running loop to refresh a stale cache entry."""
+        key = QueryCache.make_key(query, num_results)
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        async def refresh():
+            try:
+                await self._search_uncached(query, num_results)
+            except Exception as e:
+                logging.error(f"Error refreshing cached results for {query}: {e}")
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+
+        # The loop only keeps weak references to tasks, so hold on to it until it finishes
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def search_many(self, queries: List[str], num_results: int = 5) -> Dict[str, List[Dict]]:
+        """Runs several searches at once. Blocking wrapper around ``asearch_many``."""
+        return run_sync(self.asearch_many(queries, num_results))
+
+    async def asearch_many(self, queries: List[str], num_results: int = 5,
+                           timeout: Optional[float] = None) -> Dict[str, List[Dict]]:
+        """Runs several searches concurrently, fetching each page only once.
+
+        Cached queries are answered from the cache (stale ones are refreshed in
+        the background). The providers are queried for the other queries
+        concurrently, their result URLs are merged and deduplicated across
+        queries, and every unique page is fetched once in a single batch. The
+        results are then grouped back per query, with each query's most
+        relevant passages selected from the shared pages.
+
+        Args:
+            queries (List[str]): The search queries.
+            num_results (int, optional): The maximum number of results per query. Defaults to 5.
+            timeout (float, optional): Seconds allowed for all the searches, page fetches included.
+                Shortened to the time left before the request deadline, if one is set.
+
+        Returns:
+            Dict[str, List[Dict]]: The results of each query, as for ``search``, in the
+                                   order of ``queries``. Empty lists for queries that timed out.
+        """
+        timeout = deadline_timeout(timeout)
+        unique_queries = list(dict.fromkeys(queries))
+        results: Dict[str, List[Dict]] = {}
+        uncached = []
+        for query in unique_queries:
+            cached_results, stale = self.cache.get(QueryCache.make_key(query, num_results))
+            if cached_results is None:
+                uncached.append(query)
+                continue
+            logging.info(f"Serving {'stale ' if stale else ''}cached results for query: {query}")
+            if stale:
+                self._refresh_in_background(query, num_results)
+            results[query] = cached_results
+
+        if uncached:
+            try:
+                results.update(await asyncio.wait_for(self._search_many_uncached(uncached, num_results), timeout))
+            except asyncio.TimeoutError:
+                logging.warning(f"Searches for {uncached} timed out after {timeout}s")
+        return {query: results.get(query, []) for query in unique_queries}
+
+    async def _search_many_uncached(self, queries: List[str], num_results: int) -> Dict[str, List[Dict]]:
+        """Searches the providers for several queries and fetches the union of their result pages."""
+        answers = await asyncio.gather(*(self._search_providers(query, num_results) for query in queries),
+                                       return_exceptions=True)
+        search_results: List[List[SearchResult]] = []
+        for query, answer in zip(queries, answers):
+            if isinstance(answer, Exception):
+                logging.error(f"Error searching for {query}: {answer}")
+                answer = []
+            search_results.append(answer)
+
+        pages: Dict[str, str] = {}  # normalized URL -> URL to fetch
+        for result in (result for results in search_results for result in results):
+            pages.setdefault(normalize_url(result.url or ""), result.url)
+        total = sum(len(results) for results in search_results)
+        if total > len(pages):
+            logging.info(f"Fetching {len(pages)} unique pages for {total} results across {len(queries)} queries")
+        contents = dict(zip(pages, await self.fetcher.afetch(list(pages.values()), max_chars=self.candidate_length)))
+
+        grouped = {}
+        for query, results in zip(queries, search_results):
+            detailed_results = self._detailed_results(
+                query, results, [contents[normalize_url(result.url or "")] for result in results])
+            self._cache_results(query, num_results, detailed_results)
+            grouped[query] = detailed_results
+        return grouped
+
+    async def _search_uncached(self, query: str, num_results: int) -> List[Dict]:
+        """Searches the providers directly and caches the results."""
+        search_results = await self._search_providers(query, num_results)
+        detailed_results = await self._fetch_contents(query, search_results)
+        self._cache_results(query, num_results, detailed_results)
+        return detailed_results
+
+    async def _search_providers(self, query: str, num_results: int) -> List[SearchResult]:
+        """Gets the search results for a query from the first provider that answers."""
+        if self.hedged:
+            return await self._search_hedged(query, num_results)
+
         # Define the order of APIs to try
         api_order = ["Google", "Brave", "DuckDuckGo"]
 
@@ -438,43 +934,156 @@ class SearchManager:
             if api and api.is_within_quota():
                 try:
                     logging.info(f"Trying {api_name} for query: {query}")
-                    if search_results := api.search(query, num_results):
-                        # Process the results and return
-                        detailed_results = []
-                        for result in search_results:
-                            content = self.content_extractor.extract_content(result.url)
-                            result.content = content[:self.max_content_length]
-                            detailed_results.append({
-                                'title': result.title,
-                                'url': result.url,
-                                'snippet': result.snippet,
-                                'content': result.content
-                            })
-                        self._cache_results(query, detailed_results)
-                        return detailed_results
+                    if search_results := await self._timed_search(api, query, num_results):
+                        return search_results
                 except Exception as e:
                     logging.error(f"Error searching {api_name}: {e}")
 
         # If all APIs fail, try DuckDuckGo as a last resort
         logging.info(f"Trying DuckDuckGo for query: {query}")
-        duck_results = self.web_search_provider.search(query, num_results)
+        try:
+            return await self._timed_search(self.web_search_provider, query, num_results)
+        except Exception as e:
+            logging.error(f"Error searching DuckDuckGo: {e}")
+            return []
+
+    def _ordered_providers(self) -> List[SearchProvider]:
+        """Returns the providers to try, in preference order, skipping APIs that are out of quota."""
+        api_order = ["Google", "Brave", "DuckDuckGo"]
+        providers = [api for api_name in api_order for api in self.apis
+                     if api.name == api_name and api.is_within_quota()]
+        return [provider for provider in providers + [self.web_search_provider]
+                if not self.health.is_open(HealthRegistry.provider_key(self._provider_name(provider)))]
+
+    @staticmethod
+    def _provider_name(provider: SearchProvider) -> str:
+        return getattr(provider, 'name', type(provider).__name__)
+
+    async def _timed_search(self, provider: SearchProvider, query: str, num_results: int) -> List[SearchResult]:
+        """Runs a provider search, recording its latency and health.
+
+        Providers whose circuit is open are skipped without a request. Only a
+        search that raises counts as a failure; an empty answer is a query with
+        no hits. A search the provider skipped without a request (SearchSkipped)
+        and a cancelled search are not recorded either way.
+        """
+        name = self._provider_name(provider)
+        health_key = HealthRegistry.provider_key(name)
+        if not self.health.allow(health_key):
+            logging.info(f"Skipping {name}: circuit is open")
+            return []
+        start = time.monotonic()
+        try:
+            results = await provider.asearch(query, num_results)
+        except SearchSkipped as e:
+            logging.info(str(e))
+            return []
+        except Exception:
+            self.health.record_failure(health_key, time.monotonic() - start)
+            raise
+        latency = time.monotonic() - start
+        self.health.record_success(health_key, latency)
+        with self._latency_lock:
+            self._provider_latencies.setdefault(name, deque(maxlen=50)).append(latency)
+        return results
+
+    def _hedge_delay(self, provider: SearchProvider) -> float:
+        """Returns how long to wait on a provider before racing the next one.
+
+        This is the provider's SEARCH_HEDGE_PERCENTILE latency over its recent
+        successful searches, or SEARCH_HEDGE_DEFAULT_DELAY until enough samples exist.
+        """
+        with self._latency_lock:
+            latencies = sorted(self._provider_latencies.get(self._provider_name(provider), ()))
+        if len(latencies) < SEARCH_HEDGE_MIN_SAMPLES:
+            return SEARCH_HEDGE_DEFAULT_DELAY
+        index = max(int(len(latencies) * SEARCH_HEDGE_PERCENTILE / 100 + 0.5) - 1, 0)
+        return latencies[min(index, len(latencies) - 1)]
+
+    async def _search_hedged(self, query: str, num_results: int) -> List[SearchResult]:
+        """Queries the providers in preference order, racing the next one when the current one is slow.
+
+        The next provider is started when the latest one has not answered within
+        its hedge delay, or immediately when a provider fails. The first non-empty
+        answer wins and the losing searches still in flight are cancelled. Each
+        SearchAPI counts a request against its quota when it sends it, so
+        cancelled requests that reached the provider are still accounted for.
+        """
+        providers = self._ordered_providers()
+        pending: Dict[asyncio.Task, SearchProvider] = {}
+        next_index = 0
+
+        def launch() -> float:
+            nonlocal next_index
+            provider = providers[next_index]
+            next_index += 1
+            logging.info(f"Trying {self._provider_name(provider)} for query: {query}")
+            pending[asyncio.create_task(self._timed_search(provider, query, num_results))] = provider
+            return self._hedge_delay(provider)
+
+        if not providers:
+            return []
+        try:
+            delay = launch()
+            while pending:
+                done, _ = await asyncio.wait(pending, timeout=delay if next_index < len(providers) else None,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    logging.info(f"No answer within {delay:.2f}s, hedging with "
+                                 f"{self._provider_name(providers[next_index])}")
+                    delay = launch()
+                    continue
+                for task in done:
+                    provider = pending.pop(task)
+                    try:
+                        if results := task.result():
+                            logging.info(f"{self._provider_name(provider)} answered first for query: {query}")
+                            return results
+                    except Exception as e:
+                        logging.error(f"Error searching {self._provider_name(provider)}: {e}")
+                if next_index < len(providers):
+                    delay = launch()
+            return []
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _fetch_contents(self, query: str, search_results: List[SearchResult]) -> List[Dict]:
+        """Extracts the content of every search result concurrently.
+
+        Pages are fetched by ``self.fetcher`` under its concurrency limits and
+        deadline; pages that miss the deadline get empty content. Up to
+        ``candidate_length`` characters are extracted per page, and the passages
+        most relevant to the query are kept, up to ``max_content_length``.
+
+        Args:
+            query (str): The search query, used to pick the relevant passages.
+            search_results (List[SearchResult]): The results to fetch, in rank order.
+
+        Returns:
+            List[Dict]: The detailed results, in the same order as ``search_results``.
+        """
+        contents = await self.fetcher.afetch([result.url for result in search_results],
+                                             max_chars=self.candidate_length)
+        return self._detailed_results(query, search_results, contents)
+
+    def _detailed_results(self, query: str, search_results: List[SearchResult], contents: List[str]) -> List[Dict]:
+        """Pairs search results with their page contents, keeping the passages most relevant to the query."""
         detailed_results = []
-        for result in duck_results:
-            content = self.content_extractor.extract_content(result.url)
+        for result, content in zip(search_results, contents):
+            result.content = select_passages(query, content, self.max_content_length)
             detailed_results.append({
                 'title': result.title,
                 'url': result.url,
                 'snippet': result.snippet,
-                'content': content[:self.max_content_length] if content is not None else ""
+                'content': result.content
             })
-        self._cache_results(query, detailed_results)
         return detailed_results
 
-    def _cache_results(self, query: str, results: List[Dict]):
-        """Caches the search results."""
-        self.cache[query] = results
-        if len(self.cache) > self.cache_size:
-            self.cache.pop(next(iter(self.cache)))  
+    def _cache_results(self, query: str, num_results: int, results: List[Dict]):
+        """Caches the search results. Empty (failed) searches are not cached."""
+        if results:
+            self.cache.put(QueryCache.make_key(query, num_results), results)
 
 
 def initialize_search_manager():
@@ -486,30 +1095,84 @@ def initialize_search_manager():
     return None
 
 
-# Example tool function (from your description)
-def foia_search(query):
-    url = f"https://search.foia.gov/search?utf8=%E2%9C%93&m=true&affiliate=foia.gov&query={query.replace(' ', '+')}"
-    headers = {
-        'User-Agent': random.choice(WebContentExtractor.USER_AGENTS),
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-        'Cache-Control': 'max-age=0',
-        'DNT': '1',
-    }
-    response = requests.get(url, headers=headers, timeout=WebContentExtractor.TIMEOUT)
-    response.raise_for_status()
-    html_content = response.content
-    # Process the HTML content as needed, extract links from HTML content into iterable list
-    soup = BeautifulSoup(html_content, 'html.parser')
-    links = [link.get('href') for link in soup.find_all('a')]
-    content = []
-    for link in links:
-        contents = WebContentExtractor.extract_content(link)
-        content.append(contents)
-    return content
+# Matches the class of the blocks holding individual results on the FOIA.gov results page
+FOIA_RESULT_CLASS_PATTERN = re.compile(r'\bresult\b', re.IGNORECASE)
+
+
+def extract_foia_result_links(html: str, base_url: str, max_documents: int = FOIA_MAX_DOCUMENTS) -> List[Dict]:
+    """Finds the result documents linked from a FOIA.gov search results page.
+
+    Only links inside result blocks are used; if the page has none, every link
+    is considered. Links are resolved against ``base_url``. Anchors, non-HTTP
+    links (javascript:, mailto:) and links back to the search site itself
+    (pagination, navigation) are dropped, as are duplicates.
+
+    Args:
+        html (str): The results page.
+        base_url (str): The URL the results page was served from.
+        max_documents (int): Maximum number of links to return.
+
+    Returns:
+        List[Dict]: Up to ``max_documents`` dicts with 'title' and 'url' keys, in page order.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    blocks = soup.find_all(class_=FOIA_RESULT_CLASS_PATTERN)
+    anchors = [a for block in blocks for a in block.find_all('a', href=True)] if blocks else soup.find_all('a', href=True)
+    search_host = urlparse(base_url).netloc.lower()
+
+    links, seen = [], set()
+    for anchor in anchors:
+        href = anchor['href'].strip()
+        if not href or href.startswith('#'):
+            continue
+        url = urljoin(base_url, href)
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https') or parsed.netloc.lower() == search_host:
+            continue
+        key = normalize_url(url)
+        if key in seen:
+            continue
+        seen.add(key)
+        links.append({'title': anchor.get_text(" ", strip=True) or url, 'url': url})
+        if len(links) >= max_documents:
+            break
+    return links
+
+
+def foia_search(query: str, max_documents: int = FOIA_MAX_DOCUMENTS, deadline: float = FOIA_DEADLINE,
+                max_chars: Optional[int] = None, search_url: str = FOIA_SEARCH_URL) -> List[Dict]:
+    """Searches FOIA.gov and fetches the text of the top result documents.
+
+    The result documents are fetched concurrently; documents that fail or miss
+    the deadline are returned with empty text.
+
+    Args:
+        query (str): The search query.
+        max_documents (int): Maximum number of result documents to fetch.
+        deadline (float): Wall-clock seconds allowed for fetching the documents.
+        max_chars (Optional[int]): Maximum characters extracted per document.
+        search_url (str): The search endpoint (overridable for offline benchmarking).
+
+    Returns:
+        List[Dict]: One dict per result document with 'title', 'url', and 'text' keys.
+    """
+    try:
+        response = get_http_client().get(search_url,
+                                         params={'utf8': '\u2713', 'm': 'true', 'affiliate': 'foia.gov', 'query': query},
+                                         headers=WebContentExtractor.browser_headers(),
+                                         timeout=WebContentExtractor.TIMEOUT)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        logger.error(f"Error searching FOIA.gov for {query}: {e}")
+        return []
+
+    links = extract_foia_result_links(response.text, str(response.url), max_documents)
+    logger.info(f"Fetching {len(links)} FOIA documents for query: {query}")
+    fetcher = PageFetcher(WebContentExtractor(), deadline=deadline)
+    texts = fetcher.fetch([link['url'] for link in links], max_chars=max_chars)
+    return [{'title': link['title'], 'url': link['url'], 'text': text} for link, text in zip(links, texts)]
 
 
 # Example usage
@@ -0,0 +1,116 @@
+# sqlite_store.py
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteLRUStore:
+    """A size-bounded SQLite table with least recently used eviction.
+
+    Shared storage for the disk caches. Each row has a text ``key``, the
+    caller's columns, its stored ``size`` in bytes (normally of the compressed
+    payload) and a ``last_access`` time. Once the sizes add up to more than
+    ``max_bytes`` the least recently accessed rows are deleted. All methods are
+    thread-safe.
+
+    Args:
+        path (str): SQLite database file; its directory is created if needed.
+        table (str): Table name.
+        columns (Dict[str, str]): Column name to SQL type for the caller's columns.
+        max_bytes (int): Total size allowed before eviction.
+    """
+
+    def __init__(self, path: str, table: str, columns: Dict[str, str], max_bytes: int):
+        self.path = path
+        self.table = table
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        if directory := os.path.dirname(path):
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        definitions = ", ".join(f"{name} {sql_type} NOT NULL" for name, sql_type in columns.items())
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, {definitions}, "
+                           f"size INTEGER NOT NULL, last_access REAL NOT NULL)")
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_last_access ON {table} (last_access)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def get(self, key: str, columns: Sequence[str], touch: bool = True) -> Optional[tuple]:
+        """Returns the requested columns of a row, or None; ``touch`` marks the row as recently used."""
+        with self._lock:
+            row = self._conn.execute(f"SELECT {', '.join(columns)} FROM {self.table} WHERE key = ?",
+                                     (key,)).fetchone()
+            if row is not None and touch:
+                self._conn.execute(f"UPDATE {self.table} SET last_access = ? WHERE key = ?", (time.time(), key))
+                self._conn.commit()
+        return row
+
+    def put(self, key: str, size: int, values: Dict[str, Any]) -> bool:
+        """Inserts or replaces a row, evicting old rows to stay within max_bytes.
+
+        Returns:
+            bool: False if the row alone is larger than max_bytes and was not stored.
+        """
+        if size > self.max_bytes:
+            return False
+        row = {'key': key, **values, 'size': size, 'last_access': time.time()}
+        with self._lock:
+            previous = self._conn.execute(f"SELECT size FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(f"INSERT OR REPLACE INTO {self.table} ({', '.join(row)}) "
+                               f"VALUES ({', '.join('?' for _ in row)})", tuple(row.values()))
+            self._total_bytes += size - (previous[0] if previous else 0)
+            self._evict()
+            self._conn.commit()
+        return True
+
+    def update(self, key: str, values: Dict[str, Any]):
+        """Updates columns of an existing row and marks it as recently used."""
+        values = {**values, 'last_access': time.time()}
+        with self._lock:
+            self._conn.execute(f"UPDATE {self.table} SET {', '.join(f'{name} = ?' for name in values)} "
+                               f"WHERE key = ?", (*values.values(), key))
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            row = self._conn.execute(f"SELECT size FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+            self._total_bytes -= row[0]
+
+    def _evict(self):
+        """Deletes least recently used rows until the table fits in max_bytes."""
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(f"SELECT key, size FROM {self.table} ORDER BY last_access LIMIT 32").fetchall()
+            if not rows:
+                self._total_bytes = 0
+                return
+            for key, size in rows:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._total_bytes -= size
+                if self._total_bytes <= self.max_bytes:
+                    break
+
+    def get_stats(self) -> Dict[str, int]:
+        """Returns the number of rows and their total size."""
+        with self._lock:
+            entries = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+            return {'entries': entries, 'bytes': self._total_bytes}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
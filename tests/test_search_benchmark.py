@@ -0,0 +1,33 @@
+# test_search_benchmark.py
+#
+# Search latency regression check: runs a short offline workload of
+# benchmarks/search_benchmark.py and relies on its --max-p95 gate for the exit
+# status.
+
+import os
+import subprocess
+import sys
+
+BENCHMARK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks',
+                         'search_benchmark.py')
+WORKLOAD = ['--queries', '8', '--concurrency', '4', '--latency', '0.02', '--jitter', '0.01', '--api-latency', '0.01']
+
+# Generous compared with the few tenths of a second these searches take, so slow CI machines do not fail it
+MAX_P95_SECONDS = 5.0
+
+
+def run_benchmark(*args):
+    return subprocess.run([sys.executable, BENCHMARK, *WORKLOAD, *args], capture_output=True, text=True,
+                          timeout=120)
+
+
+def test_search_p95_within_budget():
+    result = run_benchmark('--max-p95', str(MAX_P95_SECONDS))
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "empty searches  0" in result.stdout, result.stdout
+
+
+def test_p95_gate_fails_when_over_budget():
+    result = run_benchmark('--max-p95', '0.0001')
+    assert result.returncode == 1, result.stdout + result.stderr
+    assert "FAIL: p95 latency" in result.stdout
@@ -0,0 +1,26 @@
+# test_startup.py
+#
+# Cold-start budget check: importing the app's core modules in a fresh
+# interpreter must stay fast and must not pull in the heavy dependencies that
+# are loaded on first use.
+
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from startup_benchmark import DEFAULT_MODULES, measure  # noqa: E402
+
+# Generous compared with the benchmark's 0.5s default, so slow CI machines do not fail it
+MAX_IMPORT_SECONDS = 1.5
+
+
+def test_heavy_modules_are_not_imported_at_startup():
+    heavy = measure(DEFAULT_MODULES, paint=False)['heavy']
+    assert heavy == [], f"imported at startup: {', '.join(heavy)}"
+
+
+def test_cold_import_within_budget():
+    median = statistics.median(measure(DEFAULT_MODULES, paint=False)['imported'] for _ in range(3))
+    assert median <= MAX_IMPORT_SECONDS, f"cold import took {median:.2f}s (budget {MAX_IMPORT_SECONDS}s)"
@@ -4,3 +4,12 @@ def get_search_instructions() -> str:
         "from them synthesize a relevant, useful, and comprehensive while succinct report that addresses and answers "
         "the searched query."
     )
+
+
+# Rough characters-per-token ratio for English text with Gemini/GPT-style tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimates the number of model tokens in a text without calling a tokenizer."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
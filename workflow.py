@@ -0,0 +1,193 @@
+# workflow.py
+
+import contextvars
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from config import WORKFLOW_MAX_PARALLELISM
+
+logger = logging.getLogger(__name__)
+
+
+class WorkflowStep:
+    """One agent call in a workflow.
+
+    Args:
+        name (str): Unique step name, used to reference the step from others.
+        model_type (str): The ModelManager model type that runs the step.
+        instruction (str, optional): What the step should do. May reference the
+            user prompt as ``{prompt}``. Defaults to the user prompt itself.
+        depends_on (Sequence[str]): Steps whose outputs this step receives.
+    """
+
+    def __init__(self, name: str, model_type: str, instruction: Optional[str] = None,
+                 depends_on: Sequence[str] = ()):
+        self.name = name
+        self.model_type = model_type
+        self.instruction = instruction
+        self.depends_on = list(depends_on)
+
+    def build_prompt(self, user_prompt: str) -> str:
+        if self.instruction is None:
+            return user_prompt
+        return self.instruction.replace("{prompt}", user_prompt)
+
+
+class Workflow:
+    """Runs agent steps declared as a dependency graph.
+
+    Steps whose dependencies have finished run concurrently, up to
+    ``max_parallelism`` at a time. Each step sees the conversation so far plus
+    the outputs of the steps it depends on, appended to its chat log the way
+    agents' turns normally are. The result reports each step's output and
+    timings, and the critical path: the chain of dependent steps whose
+    durations add up to the longest time, which bounds how fast the workflow
+    can finish however much parallelism is available.
+    """
+
+    def __init__(self, model_manager, search_manager=None, max_parallelism: int = WORKFLOW_MAX_PARALLELISM):
+        self.model_manager = model_manager
+        self.search_manager = search_manager
+        self.max_parallelism = max_parallelism
+        self.steps: Dict[str, WorkflowStep] = {}
+
+    def add_step(self, name: str, model_type: str, instruction: Optional[str] = None,
+                 depends_on: Sequence[str] = ()) -> "Workflow":
+        """Adds a step; returns the workflow so calls can be chained."""
+        if name in self.steps:
+            raise ValueError(f"Duplicate workflow step: {name}")
+        self.steps[name] = WorkflowStep(name, model_type, instruction, depends_on)
+        return self
+
+    def validate(self) -> List[str]:
+        """Checks the graph and returns the step names in a dependency-respecting order.
+
+        Raises:
+            ValueError: If a step depends on an unknown step or the steps form a cycle.
+        """
+        for step in self.steps.values():
+            for dependency in step.depends_on:
+                if dependency not in self.steps:
+                    raise ValueError(f"Workflow step '{step.name}' depends on unknown step '{dependency}'")
+
+        order = []
+        remaining = {name: set(step.depends_on) for name, step in self.steps.items()}
+        while remaining:
+            ready = [name for name, dependencies in remaining.items() if not dependencies]
+            if not ready:
+                raise ValueError(f"Workflow steps form a cycle: {', '.join(sorted(remaining))}")
+            for name in ready:
+                del remaining[name]
+                order.append(name)
+            for dependencies in remaining.values():
+                dependencies.difference_update(ready)
+        return order
+
+    def run(self, user_prompt: str, chat_log: Optional[List[str]] = None,
+            on_step_done: Optional[Callable[[str, str], None]] = None) -> Dict[str, Any]:
+        """Runs every step and returns the outputs and timings.
+
+        Args:
+            user_prompt (str): The user's request, given to every step.
+            chat_log (List[str], optional): The conversation so far. Each step's
+                output is appended to it, in dependency order, once all steps finish.
+            on_step_done (Callable[[str, str], None], optional): Called with the
+                step name and output as each step finishes, on the calling thread.
+
+        Returns:
+            Dict[str, Any]: ``outputs`` (step name to text), ``timings`` (step
+            name to start, end and duration in seconds from the workflow start),
+            ``critical_path`` (step names), ``critical_path_latency`` and
+            ``wall_time`` (seconds).
+        """
+        order = self.validate()
+        # Copying a ChatHistory keeps its summary of older turns
+        base_log = chat_log.copy() if chat_log is not None else []
+        outputs: Dict[str, str] = {}
+        timings: Dict[str, Dict[str, float]] = {}
+        start = time.perf_counter()
+
+        def run_step(step: WorkflowStep) -> str:
+            step_start = time.perf_counter()
+            step_log = base_log.copy()
+            step_log.extend(f"{self.steps[dependency].model_type.capitalize()} ({dependency}): "
+                            f"{outputs[dependency]}" for dependency in step.depends_on)
+            try:
+                return self.model_manager.generate_response(step.model_type, step.build_prompt(user_prompt),
+                                                            step_log, "", self.search_manager)
+            except Exception as e:
+                logger.error(f"Workflow step '{step.name}' failed: {e}")
+                return ""
+            finally:
+                step_end = time.perf_counter()
+                timings[step.name] = {'start': step_start - start, 'end': step_end - start,
+                                      'duration': step_end - step_start}
+
+        pending = {name: set(self.steps[name].depends_on) for name in order}
+        running: Dict[Future, str] = {}
+        with ThreadPoolExecutor(max_workers=max(self.max_parallelism, 1), thread_name_prefix="workflow") as executor:
+            while pending or running:
+                for name in [name for name in order if name in pending and not pending[name]]:
+                    del pending[name]
+                    # Run in a copy of the caller's context so steps share its request deadline
+                    context = contextvars.copy_context()
+                    running[executor.submit(context.run, run_step, self.steps[name])] = name
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    outputs[name] = future.result()
+                    if on_step_done:
+                        on_step_done(name, outputs[name])
+                    for dependencies in pending.values():
+                        dependencies.discard(name)
+
+        wall_time = time.perf_counter() - start
+        critical_path, critical_path_latency = self._critical_path(order, timings)
+        logger.info(f"Workflow finished {len(order)} steps in {wall_time:.2f}s; critical path "
+                    f"{' -> '.join(critical_path)} takes {critical_path_latency:.2f}s")
+
+        if chat_log is not None:
+            chat_log.extend(f"{self.steps[name].model_type.capitalize()}: {outputs[name]}" for name in order)
+        return {'outputs': outputs, 'timings': timings, 'critical_path': critical_path,
+                'critical_path_latency': critical_path_latency, 'wall_time': wall_time}
+
+    def _critical_path(self, order: List[str], timings: Dict[str, Dict[str, float]]) -> tuple:
+        """Finds the chain of dependent steps with the largest total duration."""
+        longest: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for name in order:
+            dependencies = self.steps[name].depends_on
+            slowest = max(dependencies, key=lambda dependency: longest[dependency], default=None)
+            previous[name] = slowest
+            longest[name] = timings[name]['duration'] + (longest[slowest] if slowest else 0.0)
+
+        if not longest:
+            return [], 0.0
+        name = max(longest, key=longest.get)
+        latency = longest[name]
+        path = []
+        while name is not None:
+            path.append(name)
+            name = previous[name]
+        return path[::-1], latency
+
+
+def think_tank_workflow(model_manager, search_manager=None,
+                        max_parallelism: int = WORKFLOW_MAX_PARALLELISM) -> Workflow:
+    """Builds the default think-tank workflow.
+
+    The prompter refines the request; brainstorming and research on it run in
+    parallel; the writer drafts from both; the critic reviews the draft; and the
+    director sums up and sets the next steps.
+    """
+    return (
+        Workflow(model_manager, search_manager, max_parallelism)
+        .add_step("prompter", "prompter")
+        .add_step("brainstorm", "brainstorm", depends_on=["prompter"])
+        .add_step("research", "researcher", depends_on=["prompter"])
+        .add_step("draft", "writer", depends_on=["brainstorm", "research"])
+        .add_step("critique", "critic", depends_on=["draft"])
+        .add_step("review", "director", depends_on=["draft", "critique"])
+    )